@@ -0,0 +1,142 @@
+from datetime import datetime
+
+import numpy as np
+
+# Columnar view of the whole history for multi-day analytics. Built once from
+# the stats mapping; every query below is a handful of vectorized numpy ops.
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday (Monday = 0)
+
+
+def iso_week_keys(days):
+    # days: datetime64[D] array -> ISO year * 100 + ISO week
+    day_num = days.astype(np.int64)
+    weekday = (day_num + EPOCH_WEEKDAY) % 7
+    thursday = days - weekday + 3
+    iso_year = thursday.astype("datetime64[Y]")
+    week = (thursday - iso_year.astype("datetime64[D]")).astype(np.int64) // 7 + 1
+    return (iso_year.astype(np.int64) + 1970) * 100 + week
+
+
+def month_keys(days):
+    months = days.astype("datetime64[M]").astype(np.int64)
+    return (months // 12 + 1970) * 100 + months % 12 + 1
+
+
+def start_hour(start=None, time_str="", minutes=0):
+    # Local hour a session started: from its start timestamp when recorded, else
+    # (legacy details) its "HH:MM" end time minus its whole minutes
+    if start is not None:
+        return datetime.fromtimestamp(start).hour
+    try:
+        h, m = time_str.split(":")
+        return (int(h) * 60 + int(m) - minutes) % 1440 // 60
+    except (ValueError, AttributeError):
+        return 0
+
+
+class HistoryArrays:
+    def __init__(self, stats):
+        keys = sorted(k for k in stats if len(k) == 10 and k[4] == "-")
+        self.days = np.array(keys, dtype="datetime64[D]")
+        self.total_sec = np.array([stats[k].get("total_focus_sec", 0) for k in keys], dtype=np.int64)
+        self.sessions = np.array([stats[k].get("sessions", 0) for k in keys], dtype=np.int64)
+        self.longest_sec = np.array([stats[k].get("longest_sec", 0) for k in keys], dtype=np.int64)
+        # One row per recorded session detail; legacy details only have whole minutes
+        day_idx, seconds, hours = [], [], []
+        for i, k in enumerate(keys):
+            for d in stats[k].get("details", []):
+                day_idx.append(i)
+                seconds.append(d["sec"] if "sec" in d else d.get("duration_min", 0) * 60)
+                hours.append(start_hour(d.get("start"), d.get("time", ""), d.get("duration_min", 0)))
+        self.session_day = np.array(day_idx, dtype=np.int64)
+        self.session_sec = np.array(seconds, dtype=np.int64)
+        self.session_hour = np.array(hours, dtype=np.int64)
+
+    @classmethod
+    def from_columns(cls, **columns):
+        # Build from ready-made arrays (e.g. a binary history file) instead of a stats mapping
+        arrays = cls.__new__(cls)
+        for name in ("days", "total_sec", "sessions", "longest_sec", "session_day", "session_sec", "session_hour"):
+            setattr(arrays, name, columns[name])
+        return arrays
+
+    def __len__(self):
+        return len(self.days)
+
+    def append_session(self, day_key, seconds, time_str, start=None):
+        # Keep the arrays in step with record_focus_session without a rebuild
+        day = np.datetime64(day_key, "D")
+        if not len(self.days) or self.days[-1] != day:
+            self.days = np.append(self.days, day)
+            self.total_sec = np.append(self.total_sec, 0)
+            self.sessions = np.append(self.sessions, 0)
+            self.longest_sec = np.append(self.longest_sec, 0)
+        self.total_sec[-1] += seconds
+        self.sessions[-1] += 1
+        self.longest_sec[-1] = max(self.longest_sec[-1], seconds)
+        self.session_day = np.append(self.session_day, len(self.days) - 1)
+        self.session_sec = np.append(self.session_sec, seconds)
+        self.session_hour = np.append(self.session_hour, start_hour(start, time_str, seconds // 60))
+
+    # Queries
+    def daily_series(self, start=None, end=None):
+        # Dense per-day minutes (days without sessions are 0) between start and end
+        if not len(self.days):
+            return np.array([], dtype="datetime64[D]"), np.array([], dtype=np.float64)
+        start = np.datetime64(start, "D") if start is not None else self.days[0]
+        end = np.datetime64(end, "D") if end is not None else self.days[-1]
+        dense_days = np.arange(start, end + 1, dtype="datetime64[D]")
+        minutes = np.zeros(len(dense_days), dtype=np.float64)
+        offsets = (self.days - start).astype(np.int64)
+        mask = (offsets >= 0) & (offsets < len(dense_days))
+        minutes[offsets[mask]] = self.total_sec[mask] / 60.0
+        return dense_days, minutes
+
+    def rolling_average(self, window, start=None, end=None):
+        days, minutes = self.daily_series(start, end)
+        csum = np.cumsum(np.concatenate(([0.0], minutes)))
+        counts = np.minimum(np.arange(1, len(minutes) + 1), window)
+        lo = np.maximum(np.arange(1, len(minutes) + 1) - window, 0)
+        return days, (csum[1:] - csum[lo]) / counts
+
+    def _grouped_totals(self, keys):
+        if not len(keys):
+            return np.array([], dtype=np.int64), np.array([], dtype=np.float64)
+        groups, inverse = np.unique(keys, return_inverse=True)
+        return groups, np.bincount(inverse, weights=self.total_sec) / 60.0
+
+    def weekly_totals(self):
+        return self._grouped_totals(iso_week_keys(self.days))
+
+    def monthly_totals(self):
+        return self._grouped_totals(month_keys(self.days))
+
+    def streaks(self, today=None):
+        # (current, longest) runs of consecutive days with any focus time
+        days, minutes = self.daily_series(end=today)
+        active = minutes > 0
+        if not active.any():
+            return 0, 0
+        edges = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        runs = ends - starts
+        current = int(runs[-1]) if ends[-1] == len(active) else 0
+        return current, int(runs.max())
+
+    def longest_sessions(self, n=10):
+        # [(day, minutes)] of the n longest recorded sessions, longest first
+        if not len(self.session_sec):
+            return []
+        n = min(n, len(self.session_sec))
+        top = np.argpartition(-self.session_sec, n - 1)[:n]
+        top = top[np.argsort(-self.session_sec[top], kind="stable")]
+        return [(str(self.days[self.session_day[i]]), int(self.session_sec[i]) // 60) for i in top]
+
+    def heatmap(self):
+        # 7 x 24 matrix of focus minutes by weekday (Monday first) and hour started
+        if not len(self.session_sec):
+            return np.zeros((7, 24))
+        weekday = (self.days[self.session_day].astype(np.int64) + EPOCH_WEEKDAY) % 7
+        cells = np.bincount(weekday * 24 + self.session_hour, weights=self.session_sec / 60.0, minlength=7 * 24)
+        return cells.reshape(7, 24)
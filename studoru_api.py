@@ -0,0 +1,284 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from urllib.parse import urlsplit, parse_qs
+
+from studoru_core import StudoruCore, build_timeline
+from studoru_profiles import ACTIVE_PROFILE
+
+# Optional local HTTP/JSON API plus server-sent events, on an asyncio loop in
+# its own thread. The owner (Tk app or headless runner) publishes state
+# snapshots and executes queued commands on its own thread, so the server never
+# touches the core directly. The app starts it when STUDORU_API=1.
+#   GET  /state            timer phase, remaining time, today's totals
+#   GET  /stats/today      today's bucket
+#   GET  /stats/range?start=YYYY-MM-DD&end=YYYY-MM-DD
+#   POST /timer/start|pause|resume|stop|reset
+#   GET  /events           text/event-stream of state snapshots
+API_HOST = "127.0.0.1"
+API_PORT = int(os.environ.get("STUDORU_API_PORT", "8765"))
+API_TOKEN = os.environ.get("STUDORU_API_TOKEN") or None
+API_DRAIN_MS = 50
+COMMAND_TIMEOUT = 5.0
+SSE_KEEPALIVE = 15.0
+TIMER_COMMANDS = ("start", "pause", "resume", "stop", "reset")
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error", 504: "Gateway Timeout"}
+
+
+def state_snapshot(core):
+    timer = core.timer
+    today = core.today()
+    return {
+        "profile": core.profile,
+        "phase": timer.phase,
+        "running": timer.running,
+        "remaining": timer.remaining_whole(),
+        "phase_seconds": timer.phase_seconds,
+        "phase_index": timer.index,
+        "phase_count": len(timer.timeline),
+        "program_remaining": int(timer.program_remaining()),
+        "storage_error": None if core.storage_error() is None else str(core.storage_error()),
+        "today": {"date": core.today_key, "total_focus_sec": today["total_focus_sec"],
+                  "sessions": today["sessions"], "longest_sec": today["longest_sec"]},
+    }
+
+
+class ApiServer:
+    def __init__(self, host=API_HOST, port=API_PORT, token=API_TOKEN):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.state = {}
+        self.state_json = b"{}"
+        self.commands = queue.SimpleQueue()
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self._subscribers = set()
+        # Open connection tasks (keep-alive and SSE), cancelled on shutdown
+        self._clients = set()
+        self._ready = threading.Event()
+        self._error = None
+
+    # Owner-thread side
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="studoru-api", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self):
+        if self.loop is not None and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def publish(self, state):
+        # Swap in the new snapshot and wake SSE streams; cheap enough to call every tick
+        body = json.dumps(state, separators=(",", ":")).encode("utf-8")
+        if body == self.state_json:
+            return
+        self.state, self.state_json = state, body
+        if self._subscribers and self.loop is not None:
+            self.loop.call_soon_threadsafe(self._notify, body)
+
+    def drain(self, handler):
+        # Run queued commands on the caller's thread: handler(name, args) -> result
+        while True:
+            try:
+                name, args, future = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(handler(name, args))
+            except Exception as e:
+                future.set_exception(e)
+
+    # Server-thread side
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(asyncio.start_server(self._client, self.host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self._error = e
+            self.loop.close()
+            return
+        finally:
+            self._ready.set()
+        self.loop.run_forever()
+        self.server.close()
+        # Close open connections first; wait_closed() waits for them on newer Pythons
+        for task in self._clients:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*self._clients, return_exceptions=True))
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    def _notify(self, body):
+        for q in self._subscribers:
+            q.put_nowait(body)
+
+    async def _client(self, reader, writer):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, 400, {"error": "bad request line"}, close=True)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _sep, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+                close = headers.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                if self.token and headers.get("authorization") != f"Bearer {self.token}":
+                    await self._send(writer, 401, {"error": "unauthorized"}, close)
+                elif urlsplit(target).path == "/events" and method == "GET":
+                    await self._events(writer)
+                    break
+                else:
+                    status, body = await self._route(method, target)
+                    await self._send(writer, status, body, close)
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Cancelled by _run on shutdown; ending normally keeps the stream callback quiet
+            pass
+        finally:
+            self._clients.discard(task)
+            writer.close()
+
+    async def _route(self, method, target):
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        if path == "/state":
+            return (200, self.state_json) if method == "GET" else (405, {"error": "GET only"})
+        if path == "/stats/today":
+            return (200, self.state.get("today", {})) if method == "GET" else (405, {"error": "GET only"})
+        if path == "/stats/range":
+            if method != "GET":
+                return 405, {"error": "GET only"}
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            return await self._command("range_totals", {"start": query.get("start"), "end": query.get("end")})
+        if path.startswith("/timer/"):
+            name = path[len("/timer/"):]
+            if name not in TIMER_COMMANDS:
+                return 404, {"error": f"unknown command {name}"}
+            if method != "POST":
+                return 405, {"error": "POST only"}
+            return await self._command(name, {})
+        return 404, {"error": "not found"}
+
+    async def _command(self, name, args):
+        future = concurrent.futures.Future()
+        self.commands.put((name, args, future))
+        try:
+            return 200, await asyncio.wait_for(asyncio.wrap_future(future), COMMAND_TIMEOUT)
+        except asyncio.TimeoutError:
+            return 504, {"error": "owner did not answer"}
+        except (ValueError, TypeError, KeyError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    async def _send(self, writer, status, body, close=False):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, separators=(",", ":")).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: {'close' if close else 'keep-alive'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _events(self, writer):
+        q = asyncio.Queue()
+        self._subscribers.add(q)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                         b"Connection: keep-alive\r\n\r\n")
+            writer.write(b"data: " + self.state_json + b"\n\n")
+            await writer.drain()
+            while True:
+                try:
+                    body = await asyncio.wait_for(q.get(), SSE_KEEPALIVE)
+                    # Only the newest snapshot matters to a slow reader
+                    while not q.empty():
+                        body = q.get_nowait()
+                    writer.write(b"data: " + body + b"\n\n")
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                await writer.drain()
+        finally:
+            self._subscribers.discard(q)
+
+
+class HeadlessRunner:
+    # Core + API without a window: python studoru_api.py [port]
+    def __init__(self, core, api, timeline=None):
+        self.core = core
+        self.api = api
+        self.timeline = timeline or build_timeline(25, 5, "minutes")
+
+    def handle(self, name, args):
+        if name == "start":
+            self.core.start_program(self.timeline)
+        elif name == "reset":
+            self.core.reset(self.timeline)
+        elif name in TIMER_COMMANDS:
+            getattr(self.core, name)()
+        elif name == "range_totals":
+            return self.core.range_totals(args["start"], args["end"])
+        else:
+            raise KeyError(name)
+        return state_snapshot(self.core)
+
+    def step(self):
+        self.core.poll()
+        self.api.drain(self.handle)
+        self.api.publish(state_snapshot(self.core))
+
+    def run(self):
+        self.api.start()
+        try:
+            while True:
+                self.step()
+                time.sleep(API_DRAIN_MS / 1000)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.api.stop()
+            self.core.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    port = int(argv[0]) if argv else API_PORT
+    runner = HeadlessRunner(StudoruCore.for_profile(ACTIVE_PROFILE), ApiServer(port=port))
+    print(f"Studoru API on http://{API_HOST}:{port}", file=sys.stderr)
+    runner.run()
+
+
+if __name__ == "__main__":
+    main()
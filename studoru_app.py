@@ -1,32 +1,129 @@
+import base64
+import os
+import time
+from studoru_perf import StartupTrace, PROFILER, debug_log
+
+STARTUP = StartupTrace()
 import tkinter as tk
 from tkinter import messagebox
 import ttkbootstrap as tb
-import winsound
-import json
-import os
-from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-# Persistence
-STATS_FILE = "studoru_stats.json"
-SCHEDULE_FILE = "studoru_schedule.json"
+from studoru_audio import AudioPlayer
+from studoru_charts import ChartRenderer, HISTORY_VIEWS, view_data
+from studoru_i18n import Localizer, DEFAULT_LANGUAGE
+from studoru_notify import BannerQueue, desktop_notifier, BANNER_MS
+from studoru_profiles import ACTIVE_PROFILE, list_profiles, validate_profile
+from studoru_core import StudoruCore, build_timeline, fmt_mmss
+from studoru_timer import WORK, LONG_BREAK
+STARTUP.mark("imports")
+
+# Fast start: show the timer first and build the matplotlib chart once idle
+FAST_START = os.environ.get("STUDORU_FAST_START", "1") == "1"
+CHART_DEFER_MS = 50
+# Analytics panel views; "day" is the per-session line, the rest span the history
+CHART_VIEWS = ["day", "week", "month", "weeks", "year", "heatmap", "longest"]
+PICKER_ROWS = 6
+PICKER_SEARCH_MS = 120
+# Local HTTP/SSE API (studoru_api), off unless STUDORU_API=1; imported only when enabled
+API = os.environ.get("STUDORU_API", "0") == "1"
+# (widget attribute, catalog key) pairs relabelled on a language switch
+LOCALIZED_WIDGETS = [
+    ("language_label", "language_label"), ("profile_label", "profile_label"), ("settings_header", "settings_title"),
+    ("schedule_header", "schedule_title"), ("analytics_header", "analytics_title"),
+    ("label_view", "view_label"), ("target_header", "target_title"),
+    ("label_unit", "unit"), ("label_study", "study"), ("label_break", "break"),
+    ("label_cycles", "cycles"), ("label_long_break", "long_break"), ("label_target", "target"),
+    ("start_btn", "start"), ("pause_btn", "pause"), ("resume_btn", "resume"),
+    ("stop_btn", "stop"), ("reset_btn", "reset"),
+    ("label_session_name", "session_name"), ("label_session_work", "study_number"),
+    ("label_session_break", "break_number"), ("label_session_cycles", "cycles_number"),
+    ("label_session_long_break", "long_break_number"), ("label_session_list", "session_list"),
+    ("add_session_btn", "add_session"), ("apply_session_btn", "use_session"),
+    ("delete_session_btn", "delete_session"),
+]
+# Debug overlay (F12): refresh period and where exported traces go
+PERF_OVERLAY_MS = 500
+PERF_TRACE_FILE = "studoru_trace.json"
+# Fire the midnight check slightly after the rollover instant
+ROLLOVER_MARGIN_MS = 500
+
+# Type-ahead schedule picker: the listbox only ever holds the visible rows,
+# the scrollbar moves a window over the matching ids
+class SchedulePicker(tb.Frame):
+    def __init__(self, master, search, label_for, width=48, rows=PICKER_ROWS):
+        super().__init__(master)
+        self.search = search
+        self.label_for = label_for
+        self.rows = rows
+        self.results = []
+        self.offset = 0
+        self.selected = None
+        self._search_job = None
+
+        self.entry = tb.Entry(self, width=width)
+        self.entry.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 2))
+        self.entry.bind("<KeyRelease>", self.on_query)
+        self.listbox = tk.Listbox(self, height=rows, width=width, activestyle="none", exportselection=False)
+        self.listbox.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = tb.Scrollbar(self, orient="vertical", command=self.on_scroll)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1))
+        self.listbox.bind("<Button-4>", lambda _e: self.scroll_by(-1))
+        self.listbox.bind("<Button-5>", lambda _e: self.scroll_by(1))
+
+    def on_query(self, _event=None):
+        # Debounced so fast typing runs one search, not one per key
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_job = self.after(PICKER_SEARCH_MS, self.refresh)
+
+    def refresh(self, select=None):
+        self._search_job = None
+        self.results = self.search(self.entry.get())
+        if select is not None and select in self.results:
+            self.selected = select
+        elif self.selected not in self.results:
+            self.selected = self.results[0] if self.results else None
+        self.offset = 0
+        if self.selected is not None:
+            idx = self.results.index(self.selected)
+            if idx >= self.rows:
+                self.offset = idx - self.rows + 1
+        self.render()
+
+    def render(self):
+        visible = self.results[self.offset:self.offset + self.rows]
+        self.listbox.delete(0, tk.END)
+        if visible:
+            self.listbox.insert(tk.END, *[self.label_for(i) for i in visible])
+        if self.selected in visible:
+            self.listbox.selection_set(visible.index(self.selected))
+        total = max(1, len(self.results))
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.rows) / total))
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, len(self.results) - self.rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return "break"
+
+    def on_scroll(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self.results)))
+        elif unit == "pages":
+            self.scroll_by(int(value) * self.rows)
+        else:
+            self.scroll_by(int(value))
 
-def load_json(path, default):
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return default
-    return default
+    def on_select(self, _event=None):
+        sel = self.listbox.curselection()
+        if sel:
+            self.selected = self.results[self.offset + sel[0]]
 
-def save_json(path, data):
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
 
 class StudoruApp:
     def __init__(self):
@@ -41,121 +138,10 @@ class StudoruApp:
         self.accent_color = "#ff8fb3"   # light pink
         self.primary_color = "#d63384"  # dark pink
 
-        # Bilingual texts (EN/ID) with emoji additions
-        self.texts = {
-            "EN": {
-                "language_label": "Language",
-                "settings_title": "🎀 Settings",
-                "unit": "Time unit",
-                "study": "Study",
-                "break": "Break",
-                "target": "Daily target (minutes)",
-                "ready": "🎀 Ready to start! 💖",
-                "start": "▶ Start 🎀",
-                "pause": "⏸️ Pause 🎀",
-                "resume": "⏯️ Resume 🎀",
-                "stop": "■ Stop 🎀",
-                "reset": "🔄 Reset 🎀",
-                "schedule_title": "🎀 Study schedule",
-                "session_name": "Session name",
-                "study_number": "Study (number)",
-                "break_number": "Break (number)",
-                "session_list": "Session list",
-                "add_session": "➕ Add session 🎀",
-                "use_session": "🎯 Use session 🎀",
-                "delete_session": "🗑️ Delete session 🎀",
-                "analytics_title": "📈 Daily study analytics 🎀",
-                "target_title": "🎯 Daily target 🎀",
-                "target_label_suffix": "minutes",
-                "unit_ready": "🎀 Unit mode: {unit}. Ready! 💖",
-                "session_added": "Session added 🎀",
-                "session_saved_msg": "Session '{name}' saved!",
-                "schedule_pick_first": "Please select a session from the list first.",
-                "schedule_not_found": "Session not found.",
-                "schedule_title_box": "Schedule 🎀",
-                "schedule_deleted_msg": "Session '{name}' deleted!",
-                "error_title": "Error",
-                "error_durations": "Enter valid numbers for durations & target!",
-                "error_session_durations": "Enter valid numbers for session durations!",
-                "error_session_name": "Session name cannot be empty!",
-                "focus_started": "🎀 Focus mode started! Keep going! 💖",
-                "paused": "⏸️ Paused. Gentle breath 🎀",
-                "resumed": "⏯️ Resumed. You’ve got this! 💖",
-                "stopped": "■ Timer stopped 🎀",
-                "reset_text": "🔄 Reset. Fresh start, shining star! 🎀",
-                "break_time": "☕ Break time! Rest softly 🎀",
-                "back_to_focus": "💻 Back to focus. Bloom again! 🎀",
-                "msg_study_done_title": "Great job!",
-                "msg_study_done_text": "Take a break!",
-                "msg_break_done_title": "Break finished!",
-                "msg_break_done_text": "Back to work!",
-                "no_sessions_chart": "No sessions today yet 🎀",
-                "chart_title": "Study duration per session (minutes) 🎀",
-                "chart_xlabel": "Session #",
-                "chart_ylabel": "Minutes",
-                "motivation_after_study": "You did amazing — small steps create big wins! 💖",
-                "motivation_after_break": "Focus gently — your future self will thank you! 💖",
-                "session_applied": "🎀 Session applied. Ready to bloom! 💖",
-                "emoji_marker": "🎀",
-            },
-            "ID": {
-                "language_label": "Bahasa",
-                "settings_title": "🎀 Pengaturan",
-                "unit": "Unit waktu",
-                "study": "Belajar",
-                "break": "Istirahat",
-                "target": "Target harian (menit)",
-                "ready": "🎀 Siap mulai! 💖",
-                "start": "▶ Mulai 🎀",
-                "pause": "⏸️ Jeda 🎀",
-                "resume": "⏯️ Lanjut 🎀",
-                "stop": "■ Berhenti 🎀",
-                "reset": "🔄 Reset 🎀",
-                "schedule_title": "🎀 Jadwal belajar",
-                "session_name": "Nama sesi",
-                "study_number": "Belajar (angka)",
-                "break_number": "Istirahat (angka)",
-                "session_list": "Daftar sesi",
-                "add_session": "➕ Tambah sesi 🎀",
-                "use_session": "🎯 Pakai sesi 🎀",
-                "delete_session": "🗑️ Hapus sesi 🎀",
-                "analytics_title": "📈 Analisis belajar harian 🎀",
-                "target_title": "🎯 Target harian 🎀",
-                "target_label_suffix": "menit",
-                "unit_ready": "🎀 Mode unit: {unit}. Siap! 💖",
-                "session_added": "Sesi ditambahkan 🎀",
-                "session_saved_msg": "Sesi '{name}' disimpan!",
-                "schedule_pick_first": "Pilih sesi dari daftar terlebih dahulu.",
-                "schedule_not_found": "Sesi tidak ditemukan.",
-                "schedule_title_box": "Jadwal 🎀",
-                "schedule_deleted_msg": "Sesi '{name}' dihapus!",
-                "error_title": "Error",
-                "error_durations": "Masukkan angka valid untuk durasi & target!",
-                "error_session_durations": "Masukkan angka valid untuk durasi sesi!",
-                "error_session_name": "Nama sesi tidak boleh kosong!",
-                "focus_started": "🎀 Mode fokus dimulai! Tetap semangat! 💖",
-                "paused": "⏸️ Dijeda. Tarik napas lembut 🎀",
-                "resumed": "⏯️ Dilanjutkan. Kamu pasti bisa! 💖",
-                "stopped": "■ Timer berhenti 🎀",
-                "reset_text": "🔄 Reset. Awal baru yang berkilau! 🎀",
-                "break_time": "☕ Waktu istirahat! Rehat lembut 🎀",
-                "back_to_focus": "💻 Kembali fokus. Mekar lagi! 🎀",
-                "msg_study_done_title": "Kerja bagus!",
-                "msg_study_done_text": "Istirahat dulu!",
-                "msg_break_done_title": "Istirahat selesai!",
-                "msg_break_done_text": "Kembali belajar!",
-                "no_sessions_chart": "Belum ada sesi hari ini 🎀",
-                "chart_title": "Durasi belajar per sesi (menit) 🎀",
-                "chart_xlabel": "Sesi ke-",
-                "chart_ylabel": "Menit",
-                "motivation_after_study": "Kamu hebat — langkah kecil menciptakan kemenangan besar! 💖",
-                "motivation_after_break": "Fokus lembut — dirimu di masa depan akan berterima kasih! 💖",
-                "session_applied": "🎀 Sesi diterapkan. Siap mekar! 💖",
-                "emoji_marker": "🎀",
-            }
-        }
-        self.language = "EN"
-        T = self.texts[self.language]
+        # UI strings come from the localization catalogs (locales/<LANG>.json)
+        self.i18n = Localizer(DEFAULT_LANGUAGE)
+        self.language = self.i18n.language
+        T = self.T = self.i18n.current
 
         # Top bar: title + language selector
         topbar = tb.Frame(self.root)
@@ -165,9 +151,17 @@ class StudoruApp:
         self.title_label.pack(side="left")
         lang_box = tb.Frame(topbar)
         lang_box.pack(side="right")
+        self.profile_label = tb.Label(lang_box, text=T["profile_label"])
+        self.profile_label.pack(side="left", padx=6)
+        # Editable: typing a new name and pressing Enter creates that profile
+        self.combo_profile = tb.Combobox(lang_box, width=14, values=list_profiles())
+        self.combo_profile.set(ACTIVE_PROFILE)
+        self.combo_profile.pack(side="left", padx=(0, 12))
+        self.combo_profile.bind("<<ComboboxSelected>>", self.on_profile_change)
+        self.combo_profile.bind("<Return>", self.on_profile_change)
         self.language_label = tb.Label(lang_box, text=T["language_label"])
         self.language_label.pack(side="left", padx=6)
-        self.combo_lang = tb.Combobox(lang_box, width=12, values=["EN", "ID"], state="readonly")
+        self.combo_lang = tb.Combobox(lang_box, width=12, values=self.i18n.languages, state="readonly")
         self.combo_lang.set(self.language)
         self.combo_lang.pack(side="left")
         self.combo_lang.bind("<<ComboboxSelected>>", self.on_language_change)
@@ -216,6 +210,18 @@ class StudoruApp:
         self.entry_target.insert(0, "120")
         self.entry_target.grid(row=0, column=7, padx=4, pady=6)
 
+        self.label_cycles = tb.Label(settings, text=T["cycles"])
+        self.label_cycles.grid(row=1, column=2, padx=6, pady=6, sticky="e")
+        self.entry_cycles = tb.Entry(settings, width=10)
+        self.entry_cycles.insert(0, "1")
+        self.entry_cycles.grid(row=1, column=3, padx=4, pady=6)
+
+        self.label_long_break = tb.Label(settings, text=T["long_break"])
+        self.label_long_break.grid(row=1, column=4, padx=6, pady=6, sticky="e")
+        self.entry_long_break = tb.Entry(settings, width=10)
+        self.entry_long_break.insert(0, "0")
+        self.entry_long_break.grid(row=1, column=5, padx=4, pady=6)
+
         # Timer
         self.timer_label = tb.Label(left, text="25:00", font=("Comic Sans MS", 64, "bold"),
                                     foreground=self.primary_color)
@@ -224,11 +230,21 @@ class StudoruApp:
         self.progress = tb.Progressbar(left, orient="horizontal", length=960, mode="determinate",
                                        bootstyle="danger-striped")
         self.progress.pack(pady=10)
+        self.program_label = tb.Label(left, text="", foreground=self.primary_color)
+        self.program_label.pack()
 
         self.status_label = tb.Label(left, text=T["ready"], font=("Comic Sans MS", 18),
                                      foreground=self.accent_color)
         self.status_label.pack(pady=6)
 
+        # Non-modal notification banner (hidden until something is queued)
+        self.banner = tb.Label(left, text="", font=("Comic Sans MS", 13, "bold"), bootstyle="inverse-danger",
+                               padding=(14, 6))
+        self.banners = BannerQueue()
+        self.desktop = desktop_notifier()
+        self.audio = AudioPlayer()
+        self._banner_job = None
+
         # Controls
         buttons = tb.Frame(left)
         buttons.pack(pady=12)
@@ -266,6 +282,18 @@ class StudoruApp:
         self.entry_session_break.insert(0, "10")
         self.entry_session_break.grid(row=2, column=1, padx=6, pady=4, sticky="w")
 
+        self.label_session_cycles = tb.Label(schedule_box, text=T["cycles_number"])
+        self.label_session_cycles.grid(row=1, column=3, padx=6, pady=4, sticky="w")
+        self.entry_session_cycles = tb.Entry(schedule_box, width=12)
+        self.entry_session_cycles.insert(0, "4")
+        self.entry_session_cycles.grid(row=1, column=4, padx=6, pady=4, sticky="w")
+
+        self.label_session_long_break = tb.Label(schedule_box, text=T["long_break_number"])
+        self.label_session_long_break.grid(row=2, column=3, padx=6, pady=4, sticky="w")
+        self.entry_session_long_break = tb.Entry(schedule_box, width=12)
+        self.entry_session_long_break.insert(0, "20")
+        self.entry_session_long_break.grid(row=2, column=4, padx=6, pady=4, sticky="w")
+
         self.add_session_btn    = tb.Button(schedule_box, text=T["add_session"],   bootstyle="success",  command=self.add_schedule_item)
         self.apply_session_btn  = tb.Button(schedule_box, text=T["use_session"],   bootstyle="info",     command=self.apply_selected_session)
         self.delete_session_btn = tb.Button(schedule_box, text=T["delete_session"],bootstyle="danger",   command=self.delete_selected_session)
@@ -273,8 +301,8 @@ class StudoruApp:
 
         self.label_session_list = tb.Label(schedule_box, text=T["session_list"])
         self.label_session_list.grid(row=3, column=0, padx=6, pady=4, sticky="w")
-        self.schedule_combo = tb.Combobox(schedule_box, width=48, state="readonly")
-        self.schedule_combo.grid(row=3, column=1, padx=6, pady=4, sticky="w")
+        self.schedule_picker = SchedulePicker(schedule_box, self.search_schedule, self.schedule_label)
+        self.schedule_picker.grid(row=3, column=1, padx=6, pady=4, sticky="w")
         self.apply_session_btn.grid(row=3, column=2, padx=6, pady=4)
         self.delete_session_btn.grid(row=3, column=3, padx=6, pady=4)
 
@@ -282,17 +310,36 @@ class StudoruApp:
         self.analytics_header = tb.Label(right, text=T["analytics_title"], font=("Comic Sans MS", 16, "bold"),
                                          foreground=self.primary_color)
         self.analytics_header.pack(anchor="w", pady=(2, 4))
+        view_box = tb.Frame(right)
+        view_box.pack(anchor="w", padx=6)
+        self.label_view = tb.Label(view_box, text=T["view_label"])
+        self.label_view.pack(side="left", padx=6)
+        self.chart_view = "day"
+        self.combo_view = tb.Combobox(view_box, width=14, state="readonly",
+                                      values=[T[f"view_{v}"] for v in CHART_VIEWS])
+        self.combo_view.current(0)
+        self.combo_view.pack(side="left")
+        self.combo_view.bind("<<ComboboxSelected>>", self.on_view_change)
 
         # Analytics (line chart)
-        analytics_box = tb.Frame(right)
-        analytics_box.pack(pady=6, padx=6, fill="both", expand=True)
-
-        self.fig = plt.figure(figsize=(7.2, 4.2), dpi=110, constrained_layout=True)
-        self.ax = self.fig.add_subplot(111)
-        self.chart_canvas = FigureCanvasTkAgg(self.fig, master=analytics_box)
-        self.chart_canvas.get_tk_widget().grid(row=0, column=0, padx=8, pady=8, sticky="nsew")
-        analytics_box.rowconfigure(0, weight=1)
-        analytics_box.columnconfigure(0, weight=1)
+        self.analytics_box = tb.Frame(right)
+        self.analytics_box.pack(pady=6, padx=6, fill="both", expand=True)
+        self.analytics_box.rowconfigure(0, weight=1)
+        self.analytics_box.columnconfigure(0, weight=1)
+        # Figure is created by build_chart()
+        self.fig = None
+        self.ax = None
+        self.chart_canvas = None
+        self.chart_image = None
+        self._chart_photo = None
+        # Off-screen history view images; chart_version changes whenever the data does
+        self.chart_renderer = ChartRenderer(self.primary_color, self.accent_color)
+        self.chart_version = 0
+        self._history = None
+        self._trend_line = None
+        self._empty_text = None
+        self._marker_texts = []
+        self._chart_background = None
 
         # Target header
         self.target_header = tb.Label(right, text=T["target_title"], font=("Comic Sans MS", 16, "bold"),
@@ -304,137 +351,179 @@ class StudoruApp:
         self.target_progress = tb.Progressbar(target_box, orient="horizontal", length=420, mode="determinate",
                                               bootstyle="warning-striped")
         self.target_progress.grid(row=0, column=0, padx=8, pady=8)
-        self.target_label = tb.Label(target_box, text=f"0 / 120 {T['target_label_suffix']}",
+        self.target_label = tb.Label(target_box, text=T.format("target_text", done=0, target=120),
                                      font=("Comic Sans MS", 13), foreground=self.primary_color)
         self.target_label.grid(row=1, column=0, padx=8, pady=2, sticky="w")
 
-        # State & persistence
-        self.is_running = False
-        self.is_work_time = True
-        self.work_remaining = 25 * 60
-        self.break_remaining = 5 * 60
-        self.session_active_seconds = 0
+        # State & persistence live in the headless core; this class only draws it
+        self.core = StudoruCore.for_profile(ACTIVE_PROFILE)
+        self._tick_job = None
+        self._tick_due = None
+        self._last_tick = None
+        self.perf_window = None
+        self._perf_job = None
+        self.api = None
+        self._rollover_job = None
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<F12>", self.toggle_perf_overlay)
+        self.schedule_picker.refresh()
+
+        self.progress["maximum"] = self.timer.phase_seconds
+        self.progress["value"] = self.timer.remaining_whole()
+        self.update_timer_label()
 
-        self.stats = load_json(STATS_FILE, {})
-        self.today_key = datetime.now().strftime("%Y-%m-%d")
-        if self.today_key not in self.stats:
-            self.stats[self.today_key] = {"total_focus_sec": 0, "sessions": 0, "longest_sec": 0, "details": []}
+        if API:
+            self.start_api()
+        self.schedule_rollover()
 
-        self.schedule = load_json(SCHEDULE_FILE, [])
-        self.refresh_schedule_combo()
+        STARTUP.mark("window built")
+        self.root.after_idle(self.audio.prerender, 1200, 400)
+        if FAST_START:
+            self.root.after(CHART_DEFER_MS, self.build_chart)
+        else:
+            self.build_chart()
 
-        self.progress["maximum"] = self.work_remaining
-        self.progress["value"] = self.work_remaining
-        self.update_timer_label()
+    # Core state shortcuts
+    @property
+    def timer(self):
+        return self.core.timer
 
-        # Chart styling and initial draw (with layout fixes + emoji markers)
-        self.apply_chart_style()
-        self.refresh_line_chart()
+    @property
+    def stats(self):
+        return self.core.stats
 
-    # Language switch
+    @property
+    def today_key(self):
+        return self.core.today_key
+
+    # Language switch: only widgets whose text differs between the catalogs are touched
     def on_language_change(self, _event=None):
         self.language = self.combo_lang.get()
         self.apply_language()
 
+    @PROFILER.timed("apply_language")
     def apply_language(self):
-        T = self.texts[self.language]
-        # Top bar
-        self.language_label.config(text=T["language_label"])
-        # Headers
-        self.settings_header.config(text=T["settings_title"])
-        self.schedule_header.config(text=T["schedule_title"])
-        self.analytics_header.config(text=T["analytics_title"])
-        self.target_header.config(text=T["target_title"])
-        # Settings fields
-        self.label_unit.config(text=T["unit"])
-        self.label_study.config(text=T["study"])
-        self.label_break.config(text=T["break"])
-        self.label_target.config(text=T["target"])
-        # Status and buttons
+        changed = self.i18n.set_language(self.language)
+        T = self.T = self.i18n.current
+        for attr, key in LOCALIZED_WIDGETS:
+            if key in changed:
+                getattr(self, attr).config(text=T[key])
+        if any(f"view_{v}" in changed for v in CHART_VIEWS):
+            self.combo_view["values"] = [T[f"view_{v}"] for v in CHART_VIEWS]
+            self.combo_view.current(CHART_VIEWS.index(self.chart_view))
         self.status_label.config(text=T["ready"])
-        self.start_btn.config(text=T["start"])
-        self.pause_btn.config(text=T["pause"])
-        self.resume_btn.config(text=T["resume"])
-        self.stop_btn.config(text=T["stop"])
-        self.reset_btn.config(text=T["reset"])
-        # Schedule labels
-        self.label_session_name.config(text=T["session_name"])
-        self.label_session_work.config(text=T["study_number"])
-        self.label_session_break.config(text=T["break_number"])
-        self.label_session_list.config(text=T["session_list"])
-        self.add_session_btn.config(text=T["add_session"])
-        self.apply_session_btn.config(text=T["use_session"])
-        self.delete_session_btn.config(text=T["delete_session"])
-        # Target label
-        total_minutes_today = self.stats[self.today_key]["total_focus_sec"] // 60
+        self.update_target_label()
+        self.update_program_label()
+        self.relabel_chart(changed)
+
+    def relabel_chart(self, changed):
+        # Swap the texts on the existing artists instead of rebuilding the axes
+        if self.ax is None:
+            return
+        if self.chart_view != "day":
+            self.render_history_view()
+            return
+        T = self.T
+        if not changed & {"chart_title", "chart_xlabel", "chart_ylabel", "no_sessions_chart", "emoji_marker"}:
+            return
+        self.ax.title.set_text(T["chart_title"])
+        self.ax.xaxis.label.set_text(T["chart_xlabel"])
+        self.ax.yaxis.label.set_text(T["chart_ylabel"])
+        if self._empty_text is not None:
+            self._empty_text.set_text(T["no_sessions_chart"])
+        for marker in self._marker_texts:
+            marker.set_text(T["emoji_marker"])
+        self.chart_canvas.draw_idle()
+
+    # Profile switch: close the current profile's files and open only the selected one
+    def on_profile_change(self, _event=None):
+        T = self.T
+        name = self.combo_profile.get().strip()
+        if name == self.core.profile:
+            return
         try:
-            target_minutes = int(self.entry_target.get())
+            validate_profile(name)
         except ValueError:
-            target_minutes = 120
-        self.target_label.config(text=f"{total_minutes_today} / {target_minutes} {T['target_label_suffix']}")
-        # Chart localization
+            messagebox.showerror(T["error_title"], T["error_profile_name"])
+            self.combo_profile.set(self.core.profile)
+            return
+        if self._tick_job is not None:
+            self.root.after_cancel(self._tick_job)
+            self._tick_job = None
+        self.core.close()
+        self.core = StudoruCore.for_profile(name)
+        self.combo_profile["values"] = list_profiles()
+        self._history = None
+        self.chart_renderer.clear()
+        self.chart_version += 1
+        self.schedule_picker.refresh()
+        self.sync_from_timer()
+        self.update_target_label()
         self.apply_chart_style()
         self.refresh_line_chart()
+        self.start_btn.config(state=tk.NORMAL)
+        self.pause_btn.config(state=tk.DISABLED)
+        self.resume_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.DISABLED)
+        self.status_label.config(text=T.format("profile_switched", name=name))
 
     # Unit change info
     def on_unit_change(self, _event=None):
-        T = self.texts[self.language]
+        T = self.T
         unit = self.combo_global_unit.get()
-        self.status_label.config(text=T["unit_ready"].format(unit=unit))
+        self.status_label.config(text=T.format("unit_ready", unit=unit))
 
     # Helpers
     def beep(self, freq=1200, ms=400):
-        try:
-            winsound.Beep(freq, ms)
-        except Exception:
-            pass
+        self.audio.play_tone(freq, ms)
 
-    def to_seconds(self, value_str):
-        val = int(value_str)
-        unit = self.combo_global_unit.get()
-        return val if unit == "seconds" else val * 60
+    def build_timeline(self):
+        # Read and parse the settings once; the timer then only walks the result
+        return build_timeline(self.entry_work.get(), self.entry_break.get(), self.combo_global_unit.get(),
+                              self.entry_cycles.get(), self.entry_long_break.get())
 
     def fmt_mmss(self, seconds):
-        m = seconds // 60
-        s = seconds % 60
-        return f"{m:02d}:{s:02d}"
+        return fmt_mmss(seconds)
 
     def update_timer_label(self):
-        current = self.work_remaining if self.is_work_time else self.break_remaining
-        self.timer_label.config(text=self.fmt_mmss(current))
+        self.timer_label.config(text=self.fmt_mmss(self.timer.remaining_whole()))
 
     # Schedule
-    def refresh_schedule_combo(self):
-        items = [f'{item["name"]} (Study {item["work"]}, Break {item["break"]})' for item in self.schedule]
-        self.schedule_combo["values"] = items
-        if items:
-            self.schedule_combo.current(0)
+    def search_schedule(self, query):
+        return self.core.schedule.search(query)
+
+    def schedule_label(self, item_id):
+        return self.core.schedule.label(self.core.schedule.get(item_id))
+
+    def selected_schedule_id(self):
+        return self.schedule_picker.selected
 
     def add_schedule_item(self):
-        T = self.texts[self.language]
+        T = self.T
         name = self.entry_session_name.get().strip()
         try:
             work_v = int(self.entry_session_work.get())
             break_v = int(self.entry_session_break.get())
+            cycles_v = int(self.entry_session_cycles.get() or 1)
+            long_v = int(self.entry_session_long_break.get() or 0)
         except ValueError:
             messagebox.showerror(T["error_title"], T["error_session_durations"])
             return
         if not name:
             messagebox.showerror(T["error_title"], T["error_session_name"])
             return
-        self.schedule.append({"name": name, "work": work_v, "break": break_v})
-        save_json(SCHEDULE_FILE, self.schedule)
-        self.refresh_schedule_combo()
-        messagebox.showinfo(T["session_added"], T["session_saved_msg"].format(name=name))
+        item = self.core.schedule.add(name, work_v, break_v, cycles_v, long_v)
+        self.schedule_picker.refresh(select=item["id"])
+        messagebox.showinfo(T["session_added"], T.format("session_saved_msg", name=name))
 
     def apply_selected_session(self):
-        T = self.texts[self.language]
-        sel = self.schedule_combo.get()
-        if not sel:
+        T = self.T
+        item_id = self.selected_schedule_id()
+        if item_id is None:
             messagebox.showwarning(T["schedule_title"], T["schedule_pick_first"])
             return
-        name_key = sel.split(" (")[0]
-        item = next((x for x in self.schedule if x["name"] == name_key), None)
+        item = self.core.schedule.get(item_id)
         if not item:
             messagebox.showwarning(T["schedule_title"], T["schedule_not_found"])
             return
@@ -442,87 +531,79 @@ class StudoruApp:
         self.entry_work.insert(0, str(item["work"]))
         self.entry_break.delete(0, tk.END)
         self.entry_break.insert(0, str(item["break"]))
+        self.entry_cycles.delete(0, tk.END)
+        self.entry_cycles.insert(0, str(item.get("cycles", 1)))
+        self.entry_long_break.delete(0, tk.END)
+        self.entry_long_break.insert(0, str(item.get("long_break", 0)))
         try:
-            self.work_remaining = self.to_seconds(self.entry_work.get())
+            self.timer.set_timeline(self.build_timeline())
         except ValueError:
-            self.work_remaining = 25 * 60
-        self.is_work_time = True
-        self.progress["maximum"] = self.work_remaining
-        self.progress["value"] = self.work_remaining
-        self.update_timer_label()
+            self.timer.load(0)
+        self.sync_from_timer()
         self.status_label.config(text=T["session_applied"])
 
     def delete_selected_session(self):
-        T = self.texts[self.language]
-        sel = self.schedule_combo.get()
-        if not sel:
+        T = self.T
+        item_id = self.selected_schedule_id()
+        if item_id is None:
             messagebox.showwarning(T["schedule_title"], T["schedule_pick_first"])
             return
-        name_key = sel.split(" (")[0]
-        idx = next((i for i, x in enumerate(self.schedule) if x["name"] == name_key), None)
-        if idx is None:
+        removed = self.core.schedule.remove(item_id)
+        if removed is None:
             messagebox.showwarning(T["schedule_title"], T["schedule_not_found"])
             return
-        removed = self.schedule.pop(idx)
-        save_json(SCHEDULE_FILE, self.schedule)
-        self.refresh_schedule_combo()
-        messagebox.showinfo(T["schedule_title"], T["schedule_deleted_msg"].format(name=removed["name"]))
+        self.schedule_picker.refresh()
+        messagebox.showinfo(T["schedule_title"], T.format("schedule_deleted_msg", name=removed["name"]))
 
     # Controls
     def start_timer(self):
-        T = self.texts[self.language]
+        T = self.T
         try:
-            work_seconds   = self.to_seconds(self.entry_work.get())
-            break_seconds  = self.to_seconds(self.entry_break.get())
+            timeline       = self.build_timeline()
             target_minutes = int(self.entry_target.get())
         except ValueError:
             messagebox.showerror(T["error_title"], T["error_durations"])
             return
 
         # Initialize from configured values
-        self.work_remaining = max(1, work_seconds)
-        self.break_remaining = max(1, break_seconds)
-        self.is_work_time = True
-        self.session_active_seconds = 0
-
-        # Progress setup
-        self.progress["maximum"] = self.work_remaining
-        self.progress["value"] = self.work_remaining
-        self.update_timer_label()
+        self.core.start_program(timeline)
+        self.sync_from_timer()
 
         # Target bar
         self.target_progress["maximum"] = max(1, target_minutes)
         self.update_target_label()
 
         # Start loop
-        self.is_running = True
         self.start_btn.config(state=tk.DISABLED)
         self.pause_btn.config(state=tk.NORMAL)
         self.resume_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
         self.status_label.config(text=T["focus_started"])
-        self.tick()
+        self.schedule_tick()
 
     def pause_timer(self):
-        T = self.texts[self.language]
-        if self.is_running:
-            self.is_running = False
+        T = self.T
+        if self.timer.running:
+            self.core.pause()
+            self.sync_from_timer()
             self.pause_btn.config(state=tk.DISABLED)
             self.resume_btn.config(state=tk.NORMAL)
             self.status_label.config(text=T["paused"])
 
     def resume_timer(self):
-        T = self.texts[self.language]
-        if not self.is_running:
-            self.is_running = True
+        T = self.T
+        if not self.timer.running:
+            self.core.resume()
+            self.sync_from_timer()
             self.pause_btn.config(state=tk.NORMAL)
             self.resume_btn.config(state=tk.DISABLED)
             self.status_label.config(text=T["resumed"])
-            self.tick()
+            self.schedule_tick()
 
     def stop_timer(self):
-        T = self.texts[self.language]
-        self.is_running = False
+        T = self.T
+        self.core.stop()
+        self.sync_from_timer()
         self.start_btn.config(state=tk.NORMAL)
         self.pause_btn.config(state=tk.DISABLED)
         self.resume_btn.config(state=tk.DISABLED)
@@ -530,92 +611,102 @@ class StudoruApp:
         self.status_label.config(text=T["stopped"])
 
     def reset_timer(self):
-        T = self.texts[self.language]
-        self.is_running = False
-        self.is_work_time = True
+        T = self.T
         try:
-            self.work_remaining = self.to_seconds(self.entry_work.get())
+            self.core.reset(self.build_timeline())
         except ValueError:
-            self.work_remaining = 25 * 60
-        self.progress["maximum"] = self.work_remaining
-        self.progress["value"] = self.work_remaining
-        self.update_timer_label()
+            self.core.reset()
+        self.sync_from_timer()
         self.start_btn.config(state=tk.NORMAL)
         self.pause_btn.config(state=tk.DISABLED)
         self.resume_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.DISABLED)
         self.status_label.config(text=T["reset_text"])
 
-    # Timer loop with robust phase transition (fixes 00:01 stuck) and messageboxes
+    # Display mirrors the timer engine; the engine owns all timing
+    def sync_from_timer(self):
+        remaining = self.timer.remaining_whole()
+        self.progress["maximum"] = self.timer.phase_seconds
+        self.progress["value"] = remaining
+        self.update_program_label()
+        self.update_timer_label()
+        if self.api is not None:
+            self.api.publish(self.api_state(self.core))
+
+    def update_program_label(self):
+        timeline = self.timer.timeline
+        if len(timeline) <= 2:
+            self.program_label.config(text="")
+            return
+        T = self.T
+        eta = fmt_mmss(int(self.timer.program_remaining()))
+        self.program_label.config(text=T.format("program_progress", n=self.timer.index + 1, total=len(timeline), eta=eta))
+
+    def schedule_tick(self):
+        # Only one pending callback at a time, so pause/resume can't stack loops
+        if self._tick_job is not None:
+            self.root.after_cancel(self._tick_job)
+        delay = self.timer.ms_until_next_second()
+        self._tick_due = time.perf_counter() + delay / 1000
+        self._tick_job = self.root.after(delay, self.tick)
+
+    # Timer loop: phase ends come from the engine's deadlines, so late callbacks
+    # (slow draws, open dialogs) are caught up instead of stretching the session
+    @PROFILER.timed("tick")
     def tick(self):
-        T = self.texts[self.language]
-        if not self.is_running:
+        T = self.T
+        self._tick_job = None
+        # Jitter: how late this callback fired; interval: distance from the 1000 ms cadence
+        now = time.perf_counter()
+        if self._tick_due is not None:
+            PROFILER.sample("tick_jitter", now - self._tick_due)
+        if self._last_tick is not None and now - self._last_tick < 2:
+            PROFILER.sample("tick_interval_error", now - self._last_tick - 1.0)
+        self._last_tick = now
+        if not self.timer.running:
             return
 
-        if self.is_work_time:
-            # Decrement and clamp
-            self.work_remaining = max(0, self.work_remaining - 1)
-            # Sync progress bar to configured max
-            try:
-                cfg_work = max(1, self.to_seconds(self.entry_work.get()))
-            except ValueError:
-                cfg_work = self.progress["maximum"]
-            self.progress["maximum"] = cfg_work
-            self.progress["value"] = self.work_remaining
-            self.session_active_seconds += 1
-
-            # Transition when time <= 0 (prevents 00:01 stuck)
-            if self.work_remaining <= 0:
-                self.beep()
-                # Record the completed study session
-                self.record_focus_session(self.session_active_seconds)
-                self.session_active_seconds = 0
-
-                # Prepare break phase from current config
-                try:
-                    self.break_remaining = max(1, self.to_seconds(self.entry_break.get()))
-                except ValueError:
-                    self.break_remaining = 5 * 60
-                self.is_work_time = False
-
-                # Update progress for break phase
-                self.progress["maximum"] = self.break_remaining
-                self.progress["value"] = self.break_remaining
-
-                # Notify and motivate
-                messagebox.showinfo(T["msg_study_done_title"], T["msg_study_done_text"])
-                self.status_label.config(text=T["break_time"])
+        if self.core.check_rollover():
+            self.on_day_changed()
+        for event, segments in self.core.poll():
+            self.beep()
+            if event.phase == WORK:
+                # The core already recorded the completed study session
+                self.on_session_recorded(segments)
+                self.sync_from_timer()
+                self.notify(T["msg_study_done_title"], T["msg_study_done_text"])
+                self.status_label.config(text=T["long_break_time"] if event.next_phase == LONG_BREAK
+                                         else T["break_time"])
                 self.append_motivation(T["motivation_after_study"])
-        else:
-            # Break phase
-            self.break_remaining = max(0, self.break_remaining - 1)
-            try:
-                cfg_break = max(1, self.to_seconds(self.entry_break.get()))
-            except ValueError:
-                cfg_break = self.progress["maximum"]
-            self.progress["maximum"] = cfg_break
-            self.progress["value"] = self.break_remaining
-
-            if self.break_remaining <= 0:
-                self.beep()
-                # Prepare next work phase
-                try:
-                    self.work_remaining = max(1, self.to_seconds(self.entry_work.get()))
-                except ValueError:
-                    self.work_remaining = 25 * 60
-                self.is_work_time = True
-
-                self.progress["maximum"] = self.work_remaining
-                self.progress["value"] = self.work_remaining
-
-                messagebox.showinfo(T["msg_break_done_title"], T["msg_break_done_text"])
+            else:
+                self.sync_from_timer()
+                self.notify(T["msg_break_done_title"], T["msg_break_done_text"])
                 self.status_label.config(text=T["back_to_focus"])
                 self.append_motivation(T["motivation_after_break"])
 
-        # Always update label (prevents display sticking at 00:01)
-        self.update_timer_label()
+        self.sync_from_timer()
         # Keep loop alive
-        self.root.after(1000, self.tick)
+        if self.timer.running:
+            self.schedule_tick()
+
+    # Notifications: queued banners, never a modal dialog in the timer loop
+    def notify(self, title, message):
+        self.desktop.notify(title, message)
+        self.banners.push(title, message)
+        if self._banner_job is None:
+            self.show_next_banner()
+
+    def show_next_banner(self):
+        item = self.banners.advance()
+        if item is None:
+            self._banner_job = None
+            self.banner.pack_forget()
+            return
+        title, message = item
+        self.banner.config(text=f"{title}  {message}")
+        if not self.banner.winfo_ismapped():
+            self.banner.pack(after=self.status_label, pady=4)
+        self._banner_job = self.root.after(BANNER_MS, self.show_next_banner)
 
     def append_motivation(self, text):
         try:
@@ -625,24 +716,126 @@ class StudoruApp:
             pass
 
     # Analytics & target (line chart) with layout fixes + emoji title and empty-state
-    def record_focus_session(self, seconds):
-        now = datetime.now().strftime("%H:%M")
-        today = self.stats[self.today_key]
-        today["total_focus_sec"] += seconds
-        today["sessions"] += 1
-        today["longest_sec"] = max(today["longest_sec"], seconds)
-        today["details"].append({
-            "name": f"Session {today['sessions']}",
-            "duration_min": seconds // 60,
-            "time": now
-        })
-        save_json(STATS_FILE, self.stats)
+    @PROFILER.timed("on_session_recorded")
+    def on_session_recorded(self, segments):
+        self.chart_version += 1
+        if self._history is not None:
+            for key, part, time_str in segments:
+                self._history.append_session(key, part.active, time_str, part.start)
+        self.refresh_line_chart()
+        self.update_target_label()
+        if self.core.storage_error() is not None:
+            self.append_motivation(self.T["error_storage"])
+
+    # Day rollover: one timer aimed at the next local midnight, independent of the tick loop
+    def schedule_rollover(self):
+        delay = int(self.core.day_clock.seconds_until_rollover() * 1000) + ROLLOVER_MARGIN_MS
+        self._rollover_job = self.root.after(delay, self.on_rollover)
+
+    def on_rollover(self):
+        self._rollover_job = None
+        if self.core.check_rollover():
+            self.on_day_changed()
+        self.schedule_rollover()
+
+    def on_day_changed(self):
+        # Today's chart and target start over; history views pick up the new day
+        self.chart_version += 1
+        self.apply_chart_style()
         self.refresh_line_chart()
         self.update_target_label()
 
+    # Multi-day views
+    def on_view_change(self, _event=None):
+        self.chart_view = CHART_VIEWS[self.combo_view.current()]
+        if self.fig is not None:
+            self.show_chart_image(self.chart_view != "day")
+        self.apply_chart_style()
+        self.refresh_line_chart()
+
+    def history_arrays(self):
+        # Columnar history, built once (this is what loads older days) and then appended to
+        if self._history is None:
+            from studoru_analytics import HistoryArrays
+            self._history = HistoryArrays(self.stats)
+        return self._history
+
+    @PROFILER.timed("render_history_view")
+    def render_history_view(self):
+        # History views are cached off-screen images; a miss is drawn here and the
+        # neighbouring views are pre-rendered in the background once idle
+        renderer = self.chart_renderer
+        key = renderer.key(self.chart_view, self.language, self.chart_version, self.chart_pixel_size())
+        png = renderer.get(key)
+        if png is None:
+            png = renderer.render(key, view_data(self.history_arrays(), self.chart_view, self.today_key), self.T)
+        # Tk only shows the image while a reference to it is held
+        self._chart_photo = tk.PhotoImage(master=self.root, data=base64.b64encode(png).decode("ascii"))
+        self.chart_image.config(image=self._chart_photo)
+        self.root.after_idle(self.prerender_charts)
+
+    def prerender_charts(self):
+        # Likely next views: the combobox neighbours of the current one, nearest first.
+        # Only once the history is loaded; pre-rendering must not be what loads it.
+        if self._history is None or self.fig is None:
+            return
+        renderer = self.chart_renderer
+        size = self.chart_pixel_size()
+        current = CHART_VIEWS.index(self.chart_view)
+        jobs = []
+        for view in sorted(HISTORY_VIEWS, key=lambda v: abs(CHART_VIEWS.index(v) - current)):
+            key = renderer.key(view, self.language, self.chart_version, size)
+            if view != self.chart_view and renderer.get(key) is None:
+                jobs.append((key, view_data(self._history, view, self.today_key), self.T))
+        renderer.prerender(jobs)
+
+    def chart_pixel_size(self):
+        # Render at the size the chart area currently has; None before it is mapped
+        widget = self.chart_canvas.get_tk_widget()
+        width, height = widget.winfo_width(), widget.winfo_height()
+        return (width, height) if width > 1 and height > 1 else None
+
+    def show_chart_image(self, image):
+        # The live day chart and the cached history images share one grid cell
+        if image:
+            self.chart_canvas.get_tk_widget().grid_remove()
+            self.chart_image.grid()
+        else:
+            self.chart_image.grid_remove()
+            self.chart_canvas.get_tk_widget().grid()
+
+    def build_chart(self):
+        # matplotlib is only imported here, off the first-paint path
+        if self.fig is not None:
+            return
+        Figure = STARTUP.timed_import("matplotlib.figure").Figure
+        FigureCanvasTkAgg = STARTUP.timed_import("matplotlib.backends.backend_tkagg").FigureCanvasTkAgg
+        self.fig = Figure(figsize=(7.2, 4.2), dpi=110, constrained_layout=True)
+        self.ax = self.fig.add_subplot(111)
+        self.chart_canvas = FigureCanvasTkAgg(self.fig, master=self.analytics_box)
+        self.chart_canvas.get_tk_widget().grid(row=0, column=0, padx=8, pady=8, sticky="nsew")
+        self.chart_image = tk.Label(self.analytics_box, background="#ffffff", borderwidth=0)
+        self.chart_image.grid(row=0, column=0, padx=8, pady=8, sticky="nsew")
+        self.chart_image.grid_remove()
+        self.chart_canvas.mpl_connect("draw_event", self.on_chart_draw)
+        # Chart styling and initial draw (with layout fixes + emoji markers)
+        self.apply_chart_style()
+        self.refresh_line_chart()
+        STARTUP.mark("chart built")
+        debug_log(f"startup report: {STARTUP.report()}")
+
     def apply_chart_style(self):
-        T = self.texts[self.language]
+        T = self.T
+        if self.ax is None:
+            return
         self.ax.clear()
+        self._trend_line = None
+        self._trend_tail = None
+        self._empty_text = None
+        self._marker_texts = []
+        self._chart_x = self._chart_y = None
+        self._chart_n = 0
+        self._chart_background = None
         # Light chart background
         self.fig.patch.set_facecolor("#ffffff")
         self.ax.set_facecolor("#ffffff")
@@ -655,47 +848,198 @@ class StudoruApp:
         for spine in self.ax.spines.values():
             spine.set_color("#000000")
         self.ax.tick_params(colors="#000000", labelsize=9)
-        # Prevent clipping of bottom x-labels and give top margin for title
-        self.fig.subplots_adjust(bottom=0.24, left=0.10, right=0.98, top=0.90)
 
+    # Persistent artists: new sessions are appended to preallocated point buffers
+    # and, while the axes limits hold, only the newest line segment and markers
+    # are blitted onto the cached background, so an append costs the same at
+    # 10 sessions as at 10,000
+    @PROFILER.timed("refresh_line_chart")
     def refresh_line_chart(self):
-        T = self.texts[self.language]
-        today = self.stats[self.today_key]
-        y = [d["duration_min"] for d in today.get("details", [])]
-        x = list(range(1, len(y) + 1))
-
-        self.apply_chart_style()
-
-        if x and y:
-            # Trend line
-            self.ax.plot(x, y, color=self.accent_color, linestyle="--", linewidth=1.2)
+        T = self.T
+        if self.ax is None:
+            return
+        if self.chart_view != "day":
+            self.render_history_view()
+            return
+        details = self.stats[self.today_key].get("details", [])
+        if self._trend_line is not None and self._chart_n > len(details):
+            # Fewer sessions than drawn (new day): start from a clean axes
+            self.apply_chart_style()
+
+        full = self._trend_line is None
+        if full:
+            # Trend line; the tail is the newest segment, drawn only when blitting
+            self._trend_line, = self.ax.plot([], [], color=self.accent_color, linestyle="--", linewidth=1.2)
+            self._trend_tail, = self.ax.plot([], [], color=self.accent_color, linestyle="--", linewidth=1.2,
+                                             animated=True)
+            # Centered empty-state message (with emoji already in text)
+            self._empty_text = self.ax.text(0.5, 0.5, T["no_sessions_chart"], color=self.primary_color,
+                                            ha="center", va="center", transform=self.ax.transAxes, fontsize=11)
+        start = self._chart_n
+        if not full and start == len(details):
+            return
+        # Minutes at second resolution; legacy details only carry whole minutes
+        new = [d["sec"] / 60 if "sec" in d else d["duration_min"] for d in details[start:]]
+        n = start + len(new)
+        self.reserve_chart_points(n)
+        self._chart_y[start:n] = new
+        self._chart_n = n
+        new_markers = []
+        for xi, yi in enumerate(new, start + 1):
             # Ribbon emoji markers at points
-            for xi, yi in zip(x, y):
-                self.ax.text(xi, yi, T["emoji_marker"], fontsize=14, ha="center", va="bottom",
-                             color=self.primary_color)
+            new_markers.append(self.ax.text(xi, yi, T["emoji_marker"], fontsize=14, ha="center",
+                                            va="bottom", color=self.primary_color))
+        self._marker_texts.extend(new_markers)
+        self._trend_line.set_data(self._chart_x[:n], self._chart_y[:n])
+        tail = max(0, start - 1)
+        self._trend_tail.set_data(self._chart_x[tail:n], self._chart_y[tail:n])
+        self._empty_text.set_visible(not n)
+
+        # Limits grow in steps (x capacity doubles, y gets headroom) so most
+        # appends land inside the current view and can be blitted
+        xmax = 8
+        while xmax < n:
+            xmax *= 2
+        ymax = self.ax.get_ylim()[1]
+        peak = max(new, default=0)
+        if full or peak * 1.15 > ymax:
+            ymax = max(1, peak) * 1.3
+        limits = ((0.5, xmax + 0.5), (0, ymax))
+        changed = limits != (tuple(self.ax.get_xlim()), tuple(self.ax.get_ylim()))
+        if changed:
+            self.ax.set_xlim(*limits[0])
+            self.ax.set_ylim(*limits[1])
+        if full or changed or self._chart_background is None:
+            # The figure's constrained layout runs as part of this draw
+            self.chart_canvas.draw_idle()
         else:
-            # Centered empty-state message (with emoji already in text)
-            self.ax.text(0.5, 0.5, T["no_sessions_chart"], color=self.primary_color,
-                         ha="center", va="center", transform=self.ax.transAxes, fontsize=11)
-        try:
-            self.fig.tight_layout()
-        except Exception:
-            pass
-        self.chart_canvas.draw()
+            self.blit_chart([self._trend_tail] + new_markers)
+
+    def reserve_chart_points(self, n):
+        # Point buffers double in size, so appending is amortized O(1)
+        import numpy as np
+        if self._chart_y is not None and len(self._chart_y) >= n:
+            return
+        capacity = 16
+        while capacity < n:
+            capacity *= 2
+        y = np.zeros(capacity)
+        if self._chart_y is not None:
+            y[:self._chart_n] = self._chart_y[:self._chart_n]
+        self._chart_x = np.arange(1, capacity + 1, dtype=float)
+        self._chart_y = y
+
+    def blit_chart(self, artists):
+        canvas = self.chart_canvas
+        canvas.restore_region(self._chart_background)
+        for artist in artists:
+            self.ax.draw_artist(artist)
+        canvas.blit(self.ax.bbox)
+        self._chart_background = canvas.copy_from_bbox(self.ax.bbox)
+
+    def on_chart_draw(self, _event=None):
+        # Every full draw refreshes the blit background
+        self._chart_background = self.chart_canvas.copy_from_bbox(self.ax.bbox)
 
     def update_target_label(self):
-        T = self.texts[self.language]
+        T = self.T
         try:
             target_minutes = max(1, int(self.entry_target.get()))
         except ValueError:
             target_minutes = 120
-        total_minutes_today = self.stats[self.today_key]["total_focus_sec"] // 60
+        total_minutes_today = self.core.today_minutes()
         self.target_progress["maximum"] = target_minutes
         self.target_progress["value"] = min(target_minutes, total_minutes_today)
-        self.target_label.config(text=f"{total_minutes_today} / {target_minutes} {T['target_label_suffix']}")
+        self.target_label.config(text=T.format("target_text", done=total_minutes_today, target=target_minutes))
+
+    # Local API: commands queued by the server thread run here, on the Tk thread
+    def start_api(self):
+        from studoru_api import ApiServer, API_DRAIN_MS, TIMER_COMMANDS, state_snapshot
+        try:
+            self.api = ApiServer().start()
+        except OSError as e:
+            debug_log(f"API not started: {e}")
+            return
+        self.api_state = state_snapshot
+        self.api_commands = TIMER_COMMANDS
+        self.api_drain_ms = API_DRAIN_MS
+        self.api.publish(state_snapshot(self.core))
+        self.drain_api()
+
+    def drain_api(self):
+        self.api.drain(self.handle_api_command)
+        self.root.after(self.api_drain_ms, self.drain_api)
+
+    def handle_api_command(self, name, args):
+        if name in self.api_commands:
+            getattr(self, f"{name}_timer")()
+        elif name == "range_totals":
+            return self.core.range_totals(args["start"], args["end"])
+        else:
+            raise KeyError(name)
+        return self.api_state(self.core)
+
+    # Debug overlay: live hot-path timings, exportable as a trace file
+    def toggle_perf_overlay(self, _event=None):
+        if self.perf_window is not None:
+            self.close_perf_overlay()
+            return
+        T = self.T
+        self.perf_window = tb.Toplevel(self.root)
+        self.perf_window.title(T["perf_title"])
+        self.perf_window.protocol("WM_DELETE_WINDOW", self.close_perf_overlay)
+        self.perf_text = tb.Label(self.perf_window, text="", font=("Courier", 10), justify="left")
+        self.perf_text.pack(anchor="w", padx=10, pady=8)
+        buttons = tb.Frame(self.perf_window)
+        buttons.pack(anchor="w", padx=10, pady=(0, 8))
+        tb.Button(buttons, text=T["perf_export"], bootstyle="info", command=self.export_perf_trace).pack(side="left")
+        tb.Button(buttons, text=T["perf_reset"], bootstyle="secondary",
+                  command=PROFILER.reset).pack(side="left", padx=8)
+        self.perf_status = tb.Label(self.perf_window, text="")
+        self.perf_status.pack(anchor="w", padx=10, pady=(0, 8))
+        self.refresh_perf_overlay()
+
+    def refresh_perf_overlay(self):
+        self._perf_job = None
+        if self.perf_window is None:
+            return
+        rows = [f"{'':22}{'count':>7}{'mean ms':>10}{'max ms':>10}{'last ms':>10}"]
+        for name, s in PROFILER.summary().items():
+            rows.append(f"{name:22}{s['count']:>7}{s['mean_ms']:>10.2f}{s['max_ms']:>10.2f}{s['last_ms']:>10.2f}")
+        self.perf_text.config(text="\n".join(rows))
+        self._perf_job = self.root.after(PERF_OVERLAY_MS, self.refresh_perf_overlay)
+
+    def close_perf_overlay(self):
+        if self._perf_job is not None:
+            self.root.after_cancel(self._perf_job)
+            self._perf_job = None
+        if self.perf_window is not None:
+            self.perf_window.destroy()
+            self.perf_window = None
+
+    def export_perf_trace(self):
+        T = self.T
+        path = os.path.abspath(PERF_TRACE_FILE)
+        try:
+            PROFILER.export(path)
+            self.perf_status.config(text=T.format("perf_exported", path=path))
+        except OSError as e:
+            self.perf_status.config(text=str(e))
+
+    def on_close(self):
+        self.close_perf_overlay()
+        if self._rollover_job is not None:
+            self.root.after_cancel(self._rollover_job)
+        self.chart_renderer.close(timeout=1)
+        if self.api is not None:
+            self.api.stop()
+        self.core.close()
+        self.root.destroy()
 
     def run(self):
         self.root.mainloop()
 
 if __name__ == "__main__":
-    StudoruApp().run()
\ No newline at end of file
+    app = StudoruApp()
+    app.root.after_idle(lambda: STARTUP.mark("first idle"))
+    app.run()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import atexit
+import io
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import wave
+from array import array
+
+# Non-blocking sound: tones are synthesized once into 16-bit PCM, cached as
+# WAV files and handed to a backend that plays them asynchronously.
+# STUDORU_AUDIO: "auto" (default), "null", or a backend name from BACKENDS.
+AUDIO_BACKEND = os.environ.get("STUDORU_AUDIO", "auto")
+SAMPLE_RATE = 22050
+FADE_MS = 8
+VOLUME = 0.5
+
+
+def render_tone(freq, ms, rate=SAMPLE_RATE):
+    n = int(rate * ms / 1000)
+    fade = max(1, int(rate * FADE_MS / 1000))
+    step = 2 * math.pi * freq / rate
+    amp = 32767 * VOLUME
+    samples = array("h", bytes(2 * n))
+    for i in range(n):
+        # Short linear fade in/out avoids clicks at the edges
+        env = min(1.0, i / fade, (n - 1 - i) / fade)
+        samples[i] = int(amp * env * math.sin(step * i))
+    return samples
+
+
+def wav_bytes(samples, rate=SAMPLE_RATE):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        if sys.byteorder == "big":
+            samples = array("h", samples)
+            samples.byteswap()
+        w.writeframes(samples.tobytes())
+    return buf.getvalue()
+
+
+class NullBackend:
+    name = "null"
+
+    def play(self, path):
+        pass
+
+
+class WinsoundBackend:
+    name = "winsound"
+
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def play(self, path):
+        # SND_ASYNC cannot be combined with SND_MEMORY, hence the cached file
+        self.winsound.PlaySound(path, self.winsound.SND_FILENAME | self.winsound.SND_ASYNC)
+
+
+class CommandBackend:
+    # paplay/aplay (Linux) or afplay (macOS), spawned and never waited on
+    def __init__(self, command):
+        self.name = command
+        self.argv = [shutil.which(command)] + (["-q"] if command == "aplay" else [])
+        self.procs = []
+
+    def play(self, path):
+        self.procs = [p for p in self.procs if p.poll() is None]
+        self.procs.append(subprocess.Popen(self.argv + [path], stdin=subprocess.DEVNULL,
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+
+
+BACKENDS = ["winsound", "afplay", "paplay", "aplay"]
+
+
+def make_backend(name):
+    if name == "null":
+        return NullBackend()
+    if name == "winsound":
+        return WinsoundBackend()
+    if shutil.which(name):
+        return CommandBackend(name)
+    raise LookupError(name)
+
+
+def select_backend(preferred=AUDIO_BACKEND):
+    names = BACKENDS if preferred == "auto" else [preferred]
+    for name in names:
+        try:
+            return make_backend(name)
+        except Exception:
+            continue
+    return NullBackend()
+
+
+class AudioPlayer:
+    def __init__(self, backend=None):
+        self.backend = backend or select_backend()
+        self._dir = None
+        self._tones = {}
+
+    def tone_path(self, freq, ms):
+        # Rendered once per (freq, ms) and reused for every later beep
+        key = (freq, ms)
+        path = self._tones.get(key)
+        if path is None:
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix="studoru-audio-")
+                atexit.register(shutil.rmtree, self._dir, True)
+            path = os.path.join(self._dir, f"tone_{freq}_{ms}.wav")
+            with open(path, "wb") as f:
+                f.write(wav_bytes(render_tone(freq, ms)))
+            self._tones[key] = path
+        return path
+
+    def prerender(self, freq, ms):
+        if self.backend.name != "null":
+            self.tone_path(freq, ms)
+
+    def play_tone(self, freq, ms):
+        if self.backend.name == "null":
+            return
+        try:
+            self.backend.play(self.tone_path(freq, ms))
+        except Exception:
+            # A broken device should cost one failed beep, not the timer
+            self.backend = NullBackend()
@@ -0,0 +1,373 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from datetime import date, timedelta
+
+from studoru_storage import (load_json, save_json, atomic_save_json, apply_session, empty_day,
+                             SessionJournal, LazyHistory)
+
+# Headless benchmarks: python studoru_bench.py [-o report.json] [name ...]
+# Results are JSON so runs from different versions can be diffed.
+HISTORY_SIZES = [10, 100, 1000, 10000, 100000]
+
+
+def synthetic_stats(n_days, sessions_per_day=4, end=None):
+    end = end or date.today()
+    stats = {}
+    for i in range(n_days):
+        day_key = (end - timedelta(days=n_days - 1 - i)).isoformat()
+        details = [{"name": f"Session {s + 1}", "duration_min": 25, "time": f"{9 + s:02d}:00"}
+                   for s in range(sessions_per_day)]
+        stats[day_key] = {"total_focus_sec": 1500 * sessions_per_day, "sessions": sessions_per_day,
+                          "longest_sec": 1500, "details": details}
+    return stats
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_startup_history(sizes=HISTORY_SIZES):
+    # Stats portion of startup: eager full parse vs. lazy today-only load, and
+    # the whole StudoruCore construction with a saved rollup index next to it
+    from studoru_core import StudoruCore
+    today_key = date.today().isoformat()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f"stats_{n}.json")
+            SessionJournal(path).compact(synthetic_stats(n))
+
+            def core():
+                return StudoruCore(stats_path=path, schedule_path=os.path.join(tmp, "schedule.json"),
+                                   write_behind=False)
+            seeded = core()
+            seeded.range_totals(today_key, today_key)
+            seeded.close()
+            results.append({
+                "days": n,
+                "file_bytes": os.path.getsize(path),
+                "full_load_s": best_of(lambda: load_json(path, {})),
+                "lazy_load_s": best_of(lambda: LazyHistory(SessionJournal(path), today_key)),
+                "core_init_s": best_of(core),
+            })
+    return results
+
+
+def bench_json_io(sizes=HISTORY_SIZES):
+    # Full-file persistence cost as the stats file grows
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            path = os.path.join(tmp, f"stats_{n}.json")
+            stats = synthetic_stats(n)
+            save_json(path, stats)
+            results.append({
+                "days": n,
+                "file_bytes": os.path.getsize(path),
+                "load_json_s": best_of(lambda: load_json(path, {})),
+                "save_json_s": best_of(lambda: save_json(path, stats)),
+                "atomic_save_json_s": best_of(lambda: atomic_save_json(path, stats)),
+            })
+    return results
+
+
+RECORD_HISTORY_DAYS = 1000
+RECORD_COUNT = 200
+
+
+def bench_record_session(history_days=RECORD_HISTORY_DAYS, count=RECORD_COUNT):
+    # record_focus_session end-to-end through the core, per backend and write mode
+    from studoru_core import StudoruCore
+    results = []
+    for backend in ("json", "sqlite"):
+        for write_behind in (False, True):
+            with tempfile.TemporaryDirectory() as tmp:
+                stats_path = os.path.join(tmp, "studoru_stats.json")
+                SessionJournal(stats_path).compact(synthetic_stats(history_days))
+                t0 = time.perf_counter()
+                core = StudoruCore(stats_path=stats_path, schedule_path=os.path.join(tmp, "schedule.json"),
+                                   db_path=os.path.join(tmp, "studoru_stats.db"), backend=backend,
+                                   write_behind=write_behind)
+                open_s = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                for _ in range(count):
+                    core.record_focus_session(1500)
+                record_s = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                core.close()
+                results.append({
+                    "backend": backend,
+                    "write_behind": write_behind,
+                    "history_days": history_days,
+                    "open_s": open_s,
+                    "record_mean_s": record_s / count,
+                    "close_s": time.perf_counter() - t0,
+                })
+    return results
+
+
+APP_STARTUP_SCRIPT = """
+import json, time
+t0 = time.perf_counter()
+from studoru_app import StudoruApp, STARTUP
+app = StudoruApp()
+app.root.update()
+built = time.perf_counter() - t0
+app.root.destroy()
+print(json.dumps({"construct_s": built, "trace": STARTUP.report()}))
+"""
+
+
+def bench_app_startup(repeat=3):
+    # Full StudoruApp construction in a fresh interpreter (needs a display)
+    env = dict(os.environ, STUDORU_AUDIO="null", PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            proc = subprocess.run([sys.executable, "-c", APP_STARTUP_SCRIPT], cwd=tmp, env=env,
+                                  capture_output=True, text=True)
+            if proc.returncode != 0:
+                lines = proc.stderr.strip().splitlines()
+                return {"skipped": lines[-1] if lines else f"exit {proc.returncode}"}
+            runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda r: r["construct_s"])
+    return {"construct_s": best["construct_s"], "runs": [r["construct_s"] for r in runs], "trace": best["trace"]}
+
+
+API_CONNECTIONS = 16
+API_REQUESTS = 20000
+
+
+async def _api_client(port, path, count, latencies, method="GET"):
+    import asyncio
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n\r\n".encode()
+    for _ in range(count):
+        t0 = time.perf_counter()
+        writer.write(request)
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+            if line == b"\r\n":
+                break
+        await reader.readexactly(length)
+        latencies.append(time.perf_counter() - t0)
+    writer.close()
+
+
+def bench_api(connections=API_CONNECTIONS, requests=API_REQUESTS):
+    # Local keep-alive clients hammering the API served by a headless core
+    import asyncio
+    import threading
+    from studoru_api import ApiServer, HeadlessRunner
+    from studoru_core import StudoruCore
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        core = StudoruCore(stats_path=os.path.join(tmp, "stats.json"), schedule_path=os.path.join(tmp, "schedule.json"),
+                           write_behind=False)
+        runner = HeadlessRunner(core, ApiServer(port=0).start())
+        running = threading.Event()
+        running.set()
+
+        def owner():
+            while running.is_set():
+                runner.step()
+                time.sleep(0.005)
+        thread = threading.Thread(target=owner, daemon=True)
+        thread.start()
+        try:
+            for path, method, n in (("/state", "GET", requests), ("/timer/resume", "POST", requests // 20)):
+                latencies = []
+                per_client = max(1, n // connections)
+
+                async def run():
+                    await asyncio.gather(*(_api_client(runner.api.port, path, per_client, latencies, method)
+                                           for _ in range(connections)))
+                t0 = time.perf_counter()
+                asyncio.run(run())
+                elapsed = time.perf_counter() - t0
+                latencies.sort()
+                results.append({
+                    "path": path,
+                    "requests": len(latencies),
+                    "connections": connections,
+                    "requests_per_s": len(latencies) / elapsed,
+                    "p50_ms": latencies[len(latencies) // 2] * 1000,
+                    "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+                })
+        finally:
+            running.clear()
+            thread.join()
+            runner.api.stop()
+            core.close()
+    return results
+
+
+SHARED_WRITERS = 4
+SHARED_SESSIONS = 500
+SHARED_WRITER_SCRIPT = """
+import sys
+from studoru_core import StudoruCore
+stats_path, schedule_path, count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+core = StudoruCore(stats_path=stats_path, schedule_path=schedule_path, write_behind=False, shared=True)
+for _ in range(count):
+    core.record_focus_session(60)
+core.close()
+"""
+
+
+def bench_shared_writers(writers=SHARED_WRITERS, sessions=SHARED_SESSIONS):
+    # Several processes recording into one shared stats file at once; every
+    # session must survive the compactions the others run in between
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        stats_path = os.path.join(tmp, "studoru_stats.json")
+        schedule_path = os.path.join(tmp, "studoru_schedule.json")
+        t0 = time.perf_counter()
+        procs = [subprocess.Popen([sys.executable, "-c", SHARED_WRITER_SCRIPT, stats_path, schedule_path,
+                                   str(sessions)], cwd=tmp, env=env) for _ in range(writers)]
+        codes = [proc.wait() for proc in procs]
+        elapsed = time.perf_counter() - t0
+        stats = SessionJournal(stats_path).load()
+        found = sum(day.get("sessions", 0) for day in stats.values())
+    expected = writers * sessions
+    return {"writers": writers, "sessions_each": sessions, "expected": expected, "found": found,
+            "lost": expected - found, "ok": found == expected and not any(codes), "elapsed_s": elapsed}
+
+
+CHART_METHODS = ["apply_chart_style", "refresh_line_chart", "reserve_chart_points", "blit_chart",
+                 "on_chart_draw", "render_history_view", "history_arrays"]
+CHART_SIZES = [10, 100, 1000, 10000]
+
+
+class ChartHarness:
+    # StudoruApp's chart methods on an off-screen Agg canvas, no Tk window needed
+    def __init__(self, n_details):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from studoru_app import StudoruApp
+        from studoru_i18n import Localizer
+        for name in CHART_METHODS:
+            setattr(self, name, types.MethodType(getattr(StudoruApp, name), self))
+        self.T = Localizer().current
+        self.chart_view = "day"
+        self._history = None
+        self.primary_color = "#d63384"
+        self.accent_color = "#ff8fb3"
+        self.today_key = date.today().isoformat()
+        self.stats = {self.today_key: empty_day()}
+        for i in range(n_details):
+            apply_session(self.stats, self.today_key, 600 + (i % 7) * 300, "09:00")
+        self.fig = Figure(figsize=(7.2, 4.2), dpi=110, constrained_layout=True)
+        self.ax = self.fig.add_subplot(111)
+        self.chart_canvas = FigureCanvasAgg(self.fig)
+        self.chart_canvas.mpl_connect("draw_event", self.on_chart_draw)
+        self.apply_chart_style()
+        self.refresh_line_chart()
+        self.chart_canvas.draw()
+
+    def append_session(self):
+        apply_session(self.stats, self.today_key, 1500, "12:00")
+        self.refresh_line_chart()
+
+    def full_redraw(self):
+        self.apply_chart_style()
+        self.refresh_line_chart()
+        self.chart_canvas.draw()
+
+
+def bench_chart_append(sizes=CHART_SIZES):
+    # One more session on a day that already has n: incremental vs. clear-and-redraw
+    results = []
+    for n in sizes:
+        harness = ChartHarness(n)
+        results.append({
+            "sessions": n,
+            "append_s": best_of(harness.append_session, repeat=20),
+            "full_redraw_s": best_of(harness.full_redraw, repeat=3),
+        })
+    return results
+
+
+CHART_VIEW_DAYS = 1000
+
+
+def bench_chart_views(history_days=CHART_VIEW_DAYS):
+    # History view switch: off-screen render on a cache miss vs. a cached image
+    from studoru_analytics import HistoryArrays
+    from studoru_charts import ChartRenderer, HISTORY_VIEWS, view_data
+    from studoru_i18n import Localizer
+    T = Localizer().current
+    today_key = date.today().isoformat()
+    history = HistoryArrays(synthetic_stats(history_days))
+    results = []
+    for view in HISTORY_VIEWS:
+        renderer = ChartRenderer("#d63384", "#ff8fb3")
+        data = view_data(history, view, today_key)
+        key = renderer.key(view, "EN", 0)
+        t0 = time.perf_counter()
+        png = renderer.render(key, data, T)
+        results.append({
+            "view": view,
+            "png_bytes": len(png),
+            "render_s": time.perf_counter() - t0,
+            "cached_s": best_of(lambda: renderer.render(key, data, T), repeat=20),
+        })
+    return results
+
+
+BENCHMARKS = {
+    "json_io": bench_json_io,
+    "startup_history": bench_startup_history,
+    "record_session": bench_record_session,
+    "chart_append": bench_chart_append,
+    "chart_views": bench_chart_views,
+    "app_startup": bench_app_startup,
+    "api": bench_api,
+    "shared_writers": bench_shared_writers,
+}
+
+
+def run_metadata():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        rev = None
+    return {"revision": rev, "python": platform.python_version(), "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    out = None
+    if "-o" in argv:
+        i = argv.index("-o")
+        out = argv[i + 1]
+        del argv[i:i + 2]
+    names = argv or list(BENCHMARKS)
+    report = {"meta": run_metadata()}
+    report.update((name, BENCHMARKS[name]()) for name in names)
+    text = json.dumps(report, indent=2)
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from datetime import datetime, time, timedelta
+
+# Local-calendar day bucketing. The current day is cached together with the
+# instant it ends, so the per-tick check is a single comparison. Sessions that
+# cross midnight are split per calendar day by SessionRecord.split.
+
+
+def day_key(dt):
+    return dt.strftime("%Y-%m-%d")
+
+
+def start_of_day(dt):
+    return datetime.combine(dt.date(), time.min, tzinfo=dt.tzinfo)
+
+
+def next_midnight(dt):
+    return start_of_day(dt) + timedelta(days=1)
+
+
+class DayClock:
+    def __init__(self, now=datetime.now):
+        self.now = now
+        self.roll(now())
+
+    def roll(self, dt):
+        self.today_key = day_key(dt)
+        self.day_start = start_of_day(dt)
+        self.rollover_at = next_midnight(dt)
+
+    def seconds_until_rollover(self):
+        return max(0.0, (self.rollover_at - self.now()).total_seconds())
+
+    def check(self):
+        # True when the calendar day changed (including a clock set backwards)
+        dt = self.now()
+        if self.day_start <= dt < self.rollover_at:
+            return False
+        self.roll(dt)
+        return True
@@ -0,0 +1,208 @@
+import io
+import threading
+from collections import OrderedDict
+
+# Off-screen rendering for the multi-day analytics views. Those views are
+# static pictures, so they are drawn on a plain Agg canvas (no Tk involved) and
+# kept as PNG bytes in an LRU cache keyed on (view, language, data version,
+# pixel size). A worker thread pre-renders the views the user is likely to open
+# next; the Tk side only turns cached bytes into a PhotoImage. matplotlib is
+# imported on first render, never at module import.
+CHART_SIZE = (7.2, 4.2)
+CHART_DPI = 110
+RENDER_CACHE_MAX = 16
+HISTORY_VIEWS = ["week", "month", "weeks", "year", "heatmap", "longest"]
+WEEKS_SHOWN = 12
+LONGEST_SHOWN = 10
+
+
+def view_data(history, view, today_key):
+    # Everything a view draws, computed up front from HistoryArrays. The result
+    # holds fresh arrays only, so it can be handed to the render thread.
+    if view in ("week", "month"):
+        n = 7 if view == "week" else 30
+        days, minutes = history.daily_series(end=today_key)
+        # The week shows its 7-day average, the month both the 7- and 30-day ones
+        averages = {w: history.rolling_average(w, end=today_key)[1][-n:] for w in (7, 30) if w <= n}
+        return {"days": days[-n:], "minutes": minutes[-n:], "averages": averages,
+                "streaks": history.streaks(today_key)}
+    if view == "weeks":
+        keys, minutes = history.weekly_totals()
+        return {"keys": keys[-WEEKS_SHOWN:], "minutes": minutes[-WEEKS_SHOWN:]}
+    if view == "year":
+        keys, minutes = history.monthly_totals()
+        return {"keys": keys[-12:], "minutes": minutes[-12:]}
+    if view == "longest":
+        return {"sessions": history.longest_sessions(LONGEST_SHOWN)}
+    return {"cells": history.heatmap()}
+
+
+def style_axes(fig, ax, T):
+    fig.patch.set_facecolor("#ffffff")
+    ax.set_facecolor("#ffffff")
+    ax.set_ylabel(T["chart_ylabel"], color="#000000", labelpad=10)
+    ax.grid(True, alpha=0.25, color="#000000")
+    for spine in ax.spines.values():
+        spine.set_color("#000000")
+    ax.tick_params(colors="#000000", labelsize=9)
+
+
+def draw_view(fig, ax, view, data, T, primary, accent):
+    style_axes(fig, ax, T)
+    if view in ("week", "month"):
+        days, minutes = data["days"], data["minutes"]
+        x = range(len(days))
+        ax.bar(x, minutes, color=accent)
+        for (window, avg), style in zip(sorted(data["averages"].items()), ("-", "--")):
+            ax.plot(x, avg, color=primary, linewidth=1.6, linestyle=style, label=T.format("rolling_avg", n=window))
+        step = 1 if view == "week" else 5
+        ax.set_xticks(list(x)[::step])
+        ax.set_xticklabels([str(d)[5:] for d in days][::step])
+        ax.set_title(T[f"chart_{view}_title"], color=primary, pad=14, fontsize=12, fontweight="bold")
+        ax.set_xlabel(T["chart_day_xlabel"], color="#000000", labelpad=10)
+        if len(days):
+            ax.legend(loc="upper left", fontsize=8, frameon=False)
+        current, longest = data["streaks"]
+        ax.text(0.99, 0.98, T.format("streak_text", current=current, longest=longest), transform=ax.transAxes,
+                ha="right", va="top", fontsize=9, color=primary)
+    elif view in ("weeks", "year"):
+        keys, minutes = data["keys"], data["minutes"]
+        x = range(len(keys))
+        ax.bar(x, minutes, color=accent)
+        ax.set_xticks(list(x))
+        label = "{}-W{:02d}" if view == "weeks" else "{}-{:02d}"
+        ax.set_xticklabels([label.format(k // 100, k % 100) for k in keys], rotation=45, ha="right")
+        ax.set_title(T[f"chart_{view}_title"], color=primary, pad=14, fontsize=12, fontweight="bold")
+        ax.set_xlabel(T["chart_week_xlabel" if view == "weeks" else "chart_month_xlabel"], color="#000000",
+                      labelpad=10)
+    elif view == "longest":
+        sessions = data["sessions"]
+        y = range(len(sessions))
+        ax.barh(y, [minutes for _day, minutes in sessions], color=accent)
+        ax.set_yticks(list(y))
+        ax.set_yticklabels([day for day, _minutes in sessions])
+        ax.invert_yaxis()
+        ax.set_title(T["chart_longest_title"], color=primary, pad=14, fontsize=12, fontweight="bold")
+        ax.set_xlabel(T["chart_ylabel"], color="#000000", labelpad=10)
+        ax.set_ylabel("")
+    else:
+        ax.grid(False)
+        ax.imshow(data["cells"], aspect="auto", cmap="RdPu", interpolation="nearest")
+        ax.set_yticks(range(7))
+        ax.set_yticklabels(T["weekdays"].split())
+        ax.set_xticks(range(0, 24, 3))
+        ax.set_title(T["chart_heatmap_title"], color=primary, pad=14, fontsize=12, fontweight="bold")
+        ax.set_xlabel(T["chart_hour_xlabel"], color="#000000", labelpad=10)
+        ax.set_ylabel("")
+
+
+def render_png(view, data, T, primary, accent, size=None, dpi=CHART_DPI):
+    # One constrained-layout pass and one Agg draw; size is in pixels
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    figsize = CHART_SIZE if size is None else (size[0] / dpi, size[1] / dpi)
+    fig = Figure(figsize=figsize, dpi=dpi, layout="constrained")
+    canvas = FigureCanvasAgg(fig)
+    draw_view(fig, fig.add_subplot(111), view, data, T, primary, accent)
+    out = io.BytesIO()
+    canvas.print_png(out)
+    return out.getvalue()
+
+
+class ChartRenderer:
+    def __init__(self, primary, accent, dpi=CHART_DPI, max_entries=RENDER_CACHE_MAX):
+        self.primary = primary
+        self.accent = accent
+        self.dpi = dpi
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._cond = threading.Condition()
+        self._jobs = []
+        self._current = None
+        self._closing = False
+        self._thread = None
+        # One figure drawn at a time, whichever thread asks
+        self._draw_lock = threading.Lock()
+
+    def key(self, view, language, version, size=None):
+        return (view, language, version, size)
+
+    def get(self, key):
+        with self._cond:
+            png = self._cache.get(key)
+            if png is not None:
+                self._cache.move_to_end(key)
+        return png
+
+    def render(self, key, data, T):
+        # Cached image for key, drawing it on the calling thread on a miss. If the
+        # worker is drawing this very key, wait for it instead of drawing twice.
+        with self._cond:
+            while self._current == key:
+                self._cond.wait()
+            png = self._cache.get(key)
+            if png is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return png
+            self.misses += 1
+            self._jobs = [job for job in self._jobs if job[0] != key]
+        return self._draw(key, data, T)
+
+    def prerender(self, jobs):
+        # jobs: [(key, data, T)], most likely first. Replaces whatever was still
+        # queued, since only the views next to the current one matter.
+        with self._cond:
+            if self._closing:
+                return
+            self._jobs = [job for job in jobs if job[0] not in self._cache]
+            if self._jobs and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="studoru-charts", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def clear(self):
+        with self._cond:
+            self._cache.clear()
+            self._jobs = []
+
+    def close(self, timeout=None):
+        with self._cond:
+            self._closing = True
+            self._jobs = []
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _draw(self, key, data, T):
+        view, _language, _version, size = key
+        with self._draw_lock:
+            png = render_png(view, data, T, self.primary, self.accent, size, self.dpi)
+        with self._cond:
+            self._cache[key] = png
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return png
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._jobs and not self._closing:
+                    self._cond.wait()
+                if self._closing:
+                    return
+                key, data, T = self._jobs.pop(0)
+                if key in self._cache:
+                    continue
+                self._current = key
+            try:
+                self._draw(key, data, T)
+            except Exception:
+                pass
+            finally:
+                with self._cond:
+                    self._current = None
+                    self._cond.notify_all()
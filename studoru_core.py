@@ -0,0 +1,327 @@
+import os
+import time
+from datetime import datetime
+
+from studoru_calendar import DayClock
+from studoru_perf import PROFILER
+from studoru_timer import TimerEngine, WORK, compile_program, simple_program
+from studoru_profiles import (STATS_FILE, SCHEDULE_FILE, STATS_DB_FILE, DEFAULT_PROFILE, PROFILES_DIR,
+                              profile_paths)
+from studoru_rollups import RollupIndex, ROLLUP_SUFFIX
+from studoru_search import NameIndex
+from studoru_sessions import SessionRecord
+from studoru_storage import (load_json, apply_session, empty_day, OpLog,
+                             SessionJournal, SqliteStatsStore, WriteBehindStore, LazyHistory)
+
+# UI-free Studoru core: timer state machine, schedule model, stats and storage.
+# Nothing here imports tkinter, ttkbootstrap, winsound or matplotlib.
+
+# Persistence (file names and profile directories live in studoru_profiles)
+# "journal" (JSON snapshot + append log) or "sqlite"
+STATS_BACKEND = os.environ.get("STUDORU_STATS_BACKEND", "journal")
+# Stats writes go through a background writer thread unless set to "0"
+WRITE_BEHIND = os.environ.get("STUDORU_WRITE_BEHIND", "1") == "1"
+# Lock and merge journal/op-log writes so several instances can share one profile
+SHARED_FILES = os.environ.get("STUDORU_SHARED_FILES", "1") == "1"
+
+
+def to_seconds(value, unit):
+    val = int(value)
+    return val if unit == "seconds" else val * 60
+
+
+def build_timeline(work, brk, unit, cycles=1, long_break=0):
+    # Parse the entry values once and compile them into the timeline the timer walks
+    program = simple_program(int(work), int(brk), int(cycles or 1), int(long_break or 0))
+    return compile_program(program, 1 if unit == "seconds" else 60)
+
+
+def fmt_mmss(seconds):
+    m = seconds // 60
+    s = seconds % 60
+    return f"{m:02d}:{s:02d}"
+
+
+def new_item_id():
+    return os.urandom(6).hex()
+
+
+class ScheduleModel:
+    # Presets keyed by a stable id. The dict is both the id index and the
+    # display order; edits are appended to an op log instead of rewriting the file.
+    def __init__(self, path=SCHEDULE_FILE, shared=False):
+        self.path = path
+        self.shared = shared
+        self.log = OpLog(path, shared=shared)
+        self._index = None
+        self.by_id, upgraded = self._read()
+        if upgraded:
+            self.compact()
+
+    def _read(self):
+        # Snapshot + op log replay; legacy items without an id get one
+        by_id = {}
+        upgraded = False
+        for item in load_json(self.path, []):
+            if "id" not in item:
+                item = dict(item, id=new_item_id())
+                upgraded = True
+            by_id[item["id"]] = item
+        for op in self.log.read():
+            if op.get("op") == "add":
+                by_id[op["item"]["id"]] = op["item"]
+            elif op.get("op") == "remove":
+                by_id.pop(op.get("id"), None)
+        return by_id, upgraded
+
+    @property
+    def items(self):
+        return list(self.by_id.values())
+
+    def __len__(self):
+        return len(self.by_id)
+
+    @staticmethod
+    def label(item):
+        label = f'{item["name"]} (Study {item["work"]}, Break {item["break"]}'
+        if item.get("cycles", 1) > 1:
+            label += f' x{item["cycles"]}'
+        if item.get("long_break"):
+            label += f', Long {item["long_break"]}'
+        return label + ")"
+
+    def labels(self):
+        return [self.label(item) for item in self.by_id.values()]
+
+    def ids(self):
+        return list(self.by_id)
+
+    def get(self, item_id):
+        return self.by_id.get(item_id)
+
+    def search(self, query, limit=None):
+        # Matching ids; an empty query lists everything in schedule order
+        if self._index is None:
+            self._index = NameIndex((i, item["name"]) for i, item in self.by_id.items())
+        hits = self._index.search(query, limit)
+        return self.ids() if hits is None else hits
+
+    def add(self, name, work, brk, cycles=1, long_break=0):
+        item = {"id": new_item_id(), "name": name, "work": work, "break": brk}
+        # Program fields are only stored when they differ from a plain work/break pair
+        if cycles > 1:
+            item["cycles"] = cycles
+        if long_break:
+            item["long_break"] = long_break
+        self.by_id[item["id"]] = item
+        if self._index is not None:
+            self._index.add(item["id"], name)
+        self._log({"op": "add", "item": item})
+        return item
+
+    def remove(self, item_id):
+        removed = self.by_id.pop(item_id, None)
+        if removed is not None:
+            if self._index is not None:
+                self._index.remove(item_id)
+            self._log({"op": "remove", "id": item_id})
+        return removed
+
+    def _log(self, op):
+        try:
+            self.log.append(op)
+            if self.log.should_compact():
+                self.compact()
+        except Exception:
+            pass
+
+    def compact(self):
+        try:
+            with self.log.locked():
+                if self.shared:
+                    # Every local edit is in the log too, so the disk state already holds
+                    # ours plus whatever other instances added or removed meanwhile
+                    by_id, upgraded = self._read()
+                    if not upgraded:
+                        self.by_id = by_id
+                        self._index = None
+                self.log.compact(self.items)
+        except Exception:
+            pass
+
+
+class StudoruCore:
+    def __init__(self, stats_path=STATS_FILE, schedule_path=SCHEDULE_FILE, db_path=STATS_DB_FILE,
+                 backend=STATS_BACKEND, write_behind=WRITE_BEHIND, clock=time.monotonic, now=datetime.now,
+                 shared=SHARED_FILES, profile=DEFAULT_PROFILE):
+        self.now = now
+        self.profile = profile
+        self.timer = TimerEngine(clock=clock)
+        self.schedule = ScheduleModel(schedule_path, shared=shared)
+        # today_key follows the local calendar day; see check_rollover()
+        self.day_clock = DayClock(now)
+        self.today_key = self.day_clock.today_key
+        self.last_segments = []
+        if backend == "sqlite":
+            self.stats_store = SqliteStatsStore(db_path)
+            self.stats_store.migrate_from_json(stats_path)
+        else:
+            self.stats_store = SessionJournal(stats_path, shared=shared)
+        if write_behind:
+            self.stats_store = WriteBehindStore(self.stats_store)
+        # Only today's bucket is read here; older days load when a view asks for them
+        try:
+            self.stats = LazyHistory(self.stats_store, self.today_key)
+        except Exception:
+            self.stats = load_json(stats_path, {})
+        if self.today_key not in self.stats:
+            self.stats[self.today_key] = empty_day()
+        # Week/month/year rollups; the file holds a total per day of history, so it
+        # is only read on the first range query (see load_rollups). Sessions
+        # recorded before then are kept to be added once it is loaded.
+        self.rollup_path = stats_path + ROLLUP_SUFFIX
+        self.rollups = None
+        self.rollups_stale = True
+        self._rollup_pending = []
+        try:
+            self._rollup_base = self.stats_store.position()
+        except Exception:
+            self._rollup_base = None
+
+    @classmethod
+    def for_profile(cls, name=DEFAULT_PROFILE, root=PROFILES_DIR, **kwargs):
+        # Only the selected profile's files are opened
+        return cls(profile=name, **profile_paths(name, root), **kwargs)
+
+    # Timer
+    def start(self, work_seconds, break_seconds):
+        self.timer.start(work_seconds, break_seconds)
+
+    def start_program(self, timeline):
+        self.timer.start_program(timeline)
+
+    def pause(self):
+        self.timer.pause()
+
+    def resume(self):
+        self.timer.resume()
+
+    def stop(self):
+        self.timer.stop()
+
+    def reset(self, timeline=None):
+        self.timer.reset(timeline)
+
+    def poll(self):
+        # Advance the timer; completed study phases are recorded before returning.
+        # Returns [(event, segments)]: the (day_key, record, "HH:MM") pieces each
+        # study phase was stored as, [] for breaks.
+        self.check_rollover()
+        results = []
+        for event in self.timer.poll():
+            segments = []
+            if event.phase == WORK:
+                self.record_focus_session(event.active_seconds, self.session_record(event))
+                segments = self.last_segments
+            results.append((event, segments))
+        return results
+
+    def session_record(self, event):
+        # Map the engine's monotonic instants onto wall-clock epoch seconds
+        if event.ended_at is None:
+            return None
+        offset = self.now().timestamp() - self.timer.clock()
+        pauses = [(s + offset, e + offset) for s, e in event.pauses]
+        return SessionRecord.ending_at(event.ended_at + offset, event.active_seconds, pauses)
+
+    # Stats
+    def check_rollover(self):
+        # Cheap enough for every tick: one datetime comparison until midnight passes
+        if not self.day_clock.check():
+            return False
+        self.today_key = self.day_clock.today_key
+        if hasattr(self.stats, "roll_to"):
+            self.stats.roll_to(self.today_key)
+        if self.today_key not in self.stats:
+            self.stats[self.today_key] = empty_day()
+        return True
+
+    def storage_error(self):
+        # Last stats write failure still waiting for a retry (write-behind), else None
+        return getattr(self.stats_store, "error", None)
+
+    def today(self):
+        return self.stats[self.today_key]
+
+    def today_minutes(self):
+        return self.today()["total_focus_sec"] // 60
+
+    @PROFILER.timed("record_focus_session")
+    def record_focus_session(self, seconds, record=None):
+        # A session that ran across midnight is credited to each day it covered
+        self.check_rollover()
+        if record is None:
+            record = SessionRecord.ending_at(self.now().timestamp(), seconds)
+        self.last_segments = record.split()
+        for key, part, time_str in self.last_segments:
+            try:
+                self.stats_store.append(key, part.active, time_str, part)
+            except Exception:
+                pass
+            apply_session(self.stats, key, part.active, time_str, part)
+            if self.rollups is None:
+                self._rollup_pending.append((key, part.active))
+            elif not self.rollups_stale:
+                self.rollups.add(key, part.active)
+                self.rollups.position += 1
+        day = self.today()
+        if self.stats_store.should_compact():
+            # As in close(): an unloaded history is compacted from disk, not loaded here
+            try:
+                self.stats_store.compact(self.stats if getattr(self.stats, "loaded", True) else None)
+            except Exception:
+                pass
+        return day
+
+    def load_rollups(self):
+        # The saved index is current if it matches the store position seen at startup
+        self.rollups = RollupIndex.load(self.rollup_path)
+        self.rollups_stale = self._rollup_base is None or self.rollups.position != self._rollup_base
+        if not self.rollups_stale:
+            for key, seconds in self._rollup_pending:
+                self.rollups.add(key, seconds)
+            self.rollups.position += len(self._rollup_pending)
+        self._rollup_pending = []
+        return self.rollups
+
+    def rollup_index(self):
+        if self.rollups is None:
+            self.load_rollups()
+        if self.rollups_stale:
+            self.rollups.rebuild(self.stats)
+            self.rollups.position = self.stats_store.position()
+            self.rollups_stale = False
+        return self.rollups
+
+    def range_totals(self, start_key, end_key):
+        return self.rollup_index().range_totals(start_key, end_key)
+
+    def close(self):
+        # Fold the journal into the snapshot so the next start replays nothing.
+        # An unloaded history is compacted from disk instead of being loaded here.
+        try:
+            self.stats_store.compact(self.stats if getattr(self.stats, "loaded", True) else None)
+        except Exception:
+            pass
+        if self.schedule.log.pending:
+            self.schedule.compact()
+        if self._rollup_pending:
+            # Loading now is far cheaper than the rebuild a stale file costs later
+            self.load_rollups()
+        if self.rollups is not None and not self.rollups_stale:
+            try:
+                self.rollups.save(self.rollup_path)
+            except Exception:
+                pass
+        if hasattr(self.stats_store, "close"):
+            self.stats_store.close()
@@ -0,0 +1,265 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, time
+
+from studoru_sessions import SessionDetail
+from studoru_storage import load_json, atomic_save_json
+
+# Columnar binary history: a fixed header, then little-endian int32/int16/int64
+# columns (one row per day, one row per session) and a small JSON blob for
+# anything the columns can't express: per-session fields keyed by session row,
+# per-day fields keyed "d<row>" (null marks a bucket field the day did not
+# have, such as a missing details list). Version 2 stores session seconds and
+# start/end epoch timestamps; version 1 files (whole minutes) still read. A file can be memory-mapped and queried
+# without decoding the rest; analytics wraps the columns as numpy arrays.
+#   python studoru_export.py to-bin studoru_stats.json history.sdrb
+#   python studoru_export.py to-json history.sdrb studoru_stats.json
+MAGIC = b"SDRB"
+VERSION = 2
+READ_VERSIONS = (1, 2)
+BINARY_SUFFIX = ".sdrb"
+HEADER = struct.Struct("<4sHHIII4x")  # magic, version, flags, days, sessions, extras bytes
+EPOCH = date(1970, 1, 1).toordinal()
+DAY_COLUMNS = ["days", "total_sec", "sessions", "longest_sec"]
+RECORD_KEYS = ("start", "end", "sec")
+DAY_FIELDS = ("total_focus_sec", "sessions", "longest_sec", "details")
+
+
+def parse_minute(time_str):
+    # "HH:MM" -> minute of day, -1 when it doesn't round-trip exactly
+    try:
+        h, m = time_str.split(":")
+        minute = int(h) * 60 + int(m)
+    except (ValueError, AttributeError):
+        return -1
+    return minute if 0 <= minute < 1440 and time_str == f"{minute // 60:02d}:{minute % 60:02d}" else -1
+
+
+def _le(values, typecode):
+    col = array(typecode, values)
+    if sys.byteorder == "big":
+        col.byteswap()
+    return col.tobytes()
+
+
+def encode_history(stats):
+    keys = sorted(k for k in stats if len(k) == 10 and k[4] == "-")
+    days, total_sec, sessions, longest_sec, offsets = [], [], [], [], [0]
+    session_sec, session_time, session_start, session_end = [], [], [], []
+    extras = {}
+    for key in keys:
+        day = stats[key]
+        details = day.get("details", [])
+        days.append(date.fromisoformat(key).toordinal() - EPOCH)
+        total_sec.append(day.get("total_focus_sec", 0))
+        sessions.append(day.get("sessions", len(details)))
+        longest_sec.append(day.get("longest_sec", 0))
+        day_extra = {k: v for k, v in day.items() if k not in DAY_FIELDS}
+        day_extra.update((k, None) for k in DAY_FIELDS if k not in day)
+        if day_extra:
+            extras[f"d{len(days) - 1}"] = day_extra
+        for n, d in enumerate(details, 1):
+            minute = parse_minute(d.get("time"))
+            # Second-resolution sessions carry start/end/sec; legacy ones whole minutes
+            timed = all(isinstance(d.get(k), int) for k in RECORD_KEYS)
+            sec = d["sec"] if timed else d.get("duration_min", 0) * 60
+            session_sec.append(sec)
+            session_time.append(minute)
+            session_start.append(d["start"] if timed else -1)
+            session_end.append(d["end"] if timed else -1)
+            # Default names, canonical times and derived minutes are implied by the columns
+            known = ("name", "duration_min", "time") + (RECORD_KEYS if timed else ())
+            extra = {k: v for k, v in d.items() if k not in known}
+            if d.get("name") != f"Session {n}":
+                extra["name"] = d.get("name")
+            if minute < 0 and "time" in d:
+                extra["time"] = d["time"]
+            if d.get("duration_min", 0) != sec // 60:
+                extra["duration_min"] = d.get("duration_min")
+            if extra:
+                extras[str(len(session_sec) - 1)] = extra
+        offsets.append(len(session_sec))
+    extras_blob = json.dumps(extras, ensure_ascii=False, separators=(",", ":")).encode("utf-8") if extras else b""
+    parts = [HEADER.pack(MAGIC, VERSION, 0, len(days), len(session_sec), len(extras_blob)),
+             _le(days, "i"), _le(total_sec, "i"), _le(sessions, "i"), _le(longest_sec, "i"),
+             _le(offsets, "i"), _le(session_sec, "i"), _le(session_time, "h")]
+    # int64 columns start 8-byte aligned
+    size = sum(len(part) for part in parts)
+    parts += [b"\0" * (-size % 8), _le(session_start, "q"), _le(session_end, "q"), extras_blob]
+    return b"".join(parts)
+
+
+def write_history(stats, path):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode_history(stats))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class HistoryFile:
+    # Read-only, memory-mapped view; columns are zero-copy memoryviews
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        buf = memoryview(self._map)
+        if len(buf) < HEADER.size:
+            raise ValueError(f"{path}: not a history file")
+        magic, version, _flags, n_days, n_sessions, n_extras = HEADER.unpack_from(buf)
+        if magic != MAGIC or version not in READ_VERSIONS:
+            raise ValueError(f"{path}: unsupported history file")
+        self.version = version
+        self.n_days = n_days
+        self.n_sessions = n_sessions
+        pos = HEADER.size
+        for name, n in zip(DAY_COLUMNS + ["offsets", "session_sec"], [n_days] * 4 + [n_days + 1, n_sessions]):
+            setattr(self, name, self._column(buf, pos, n, "i"))
+            pos += 4 * n
+        self.session_time = self._column(buf, pos, n_sessions, "h")
+        pos += 2 * n_sessions
+        if version == 1:
+            # Whole minutes, no timestamps
+            self.session_sec = array("i", (m * 60 for m in self.session_sec))
+            self.session_start = self.session_end = None
+            pos += pos % 4
+        else:
+            pos += -pos % 8
+            self.session_start = self._column(buf, pos, n_sessions, "q")
+            self.session_end = self._column(buf, pos + 8 * n_sessions, n_sessions, "q")
+            pos += 16 * n_sessions
+        self._extras_raw = buf[pos:pos + n_extras]
+        self._extras = None
+
+    @staticmethod
+    def _column(buf, pos, n, typecode):
+        size = array(typecode).itemsize
+        view = buf[pos:pos + n * size]
+        if sys.byteorder == "big":
+            col = array(typecode, view.tobytes())
+            col.byteswap()
+            return col
+        return view.cast(typecode)
+
+    def __len__(self):
+        return self.n_days
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for name in DAY_COLUMNS + ["offsets", "session_sec", "session_time", "session_start", "session_end"]:
+            col = getattr(self, name, None)
+            if isinstance(col, memoryview):
+                col.release()
+        self._extras_raw.release()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    @property
+    def extras(self):
+        if self._extras is None:
+            self._extras = json.loads(bytes(self._extras_raw).decode("utf-8")) if len(self._extras_raw) else {}
+        return self._extras
+
+    def day_key(self, i):
+        return date.fromordinal(self.days[i] + EPOCH).isoformat()
+
+    def find(self, day_key):
+        # Row index of a day via binary search over the sorted day column, or None
+        target = date.fromisoformat(day_key).toordinal() - EPOCH
+        i = bisect_left(self.days, target)
+        return i if i < self.n_days and self.days[i] == target else None
+
+    def day(self, i):
+        # Rebuild one stats bucket in the JSON layout
+        details = []
+        extras = self.extras
+        for n, s in enumerate(range(self.offsets[i], self.offsets[i + 1]), 1):
+            sec = self.session_sec[s]
+            d = {"name": f"Session {n}", "duration_min": sec // 60}
+            minute = self.session_time[s]
+            if minute >= 0:
+                d["time"] = f"{minute // 60:02d}:{minute % 60:02d}"
+            if self.session_start is not None and self.session_start[s] >= 0:
+                d.update(start=self.session_start[s], end=self.session_end[s], sec=sec)
+            d.update(extras.get(str(s), {}))
+            details.append(SessionDetail.from_dict(d))
+        bucket = {"total_focus_sec": self.total_sec[i], "sessions": self.sessions[i],
+                  "longest_sec": self.longest_sec[i], "details": details}
+        for k, v in extras.get(f"d{i}", {}).items():
+            if v is None:
+                bucket.pop(k, None)
+            else:
+                bucket[k] = v
+        return bucket
+
+    def get(self, day_key, default=None):
+        i = self.find(day_key)
+        return default if i is None else self.day(i)
+
+    def to_stats(self):
+        return {self.day_key(i): self.day(i) for i in range(self.n_days)}
+
+    def history_arrays(self):
+        # Columns go straight into numpy, no per-record Python work
+        import numpy as np
+        from studoru_analytics import HistoryArrays
+        offsets = np.asarray(self.offsets, dtype=np.int64)
+        session_day = np.repeat(np.arange(self.n_days, dtype=np.int64), np.diff(offsets))
+        session_sec = np.asarray(self.session_sec, dtype=np.int64)
+        # Start hour: end minute minus duration for legacy rows; from the start
+        # timestamp against each day's local midnight (one call per day) otherwise
+        minute = np.asarray(self.session_time, dtype=np.int64)
+        hour = np.where(minute >= 0, (minute - session_sec // 60) % 1440 // 60, 0)
+        if self.session_start is not None and self.n_sessions:
+            start = np.asarray(self.session_start, dtype=np.int64)
+            midnight = np.array([datetime.combine(date.fromordinal(d + EPOCH), time.min).timestamp()
+                                 for d in self.days], dtype=np.int64)
+            timed = start >= 0
+            hour[timed] = np.clip((start - midnight[session_day])[timed] // 3600, 0, 23)
+        return HistoryArrays.from_columns(
+            days=np.asarray(self.days, dtype=np.int64).astype("datetime64[D]"),
+            total_sec=np.asarray(self.total_sec, dtype=np.int64),
+            sessions=np.asarray(self.sessions, dtype=np.int64),
+            longest_sec=np.asarray(self.longest_sec, dtype=np.int64),
+            session_day=session_day,
+            session_sec=session_sec,
+            session_hour=hour)
+
+
+def read_history(path):
+    with HistoryFile(path) as history:
+        return history.to_stats()
+
+
+def json_to_binary(json_path, bin_path):
+    write_history(load_json(json_path, {}), bin_path)
+
+
+def binary_to_json(bin_path, json_path):
+    atomic_save_json(json_path, read_history(bin_path))
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 3 or argv[0] not in ("to-bin", "to-json"):
+        print("usage: studoru_export.py to-bin|to-json SOURCE DEST", file=sys.stderr)
+        return 2
+    convert = json_to_binary if argv[0] == "to-bin" else binary_to_json
+    convert(argv[1], argv[2])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
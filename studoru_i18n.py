@@ -0,0 +1,112 @@
+import json
+import os
+from collections.abc import Mapping
+from string import Formatter
+
+# UI strings live in locales/<LANG>.json. A catalog is read the first time its
+# language is used, so shipping more languages adds no startup work. Templates
+# with {fields} are parsed once and rendered results are memoized.
+LOCALE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locales")
+DEFAULT_LANGUAGE = "EN"
+RENDER_CACHE_MAX = 512
+
+
+def available_languages(locale_dir=LOCALE_DIR):
+    # File names only; nothing is parsed
+    try:
+        return sorted(name[:-5] for name in os.listdir(locale_dir) if name.endswith(".json"))
+    except OSError:
+        return [DEFAULT_LANGUAGE]
+
+
+class Template:
+    def __init__(self, text):
+        self.text = text
+        self.parts = []
+        for literal, field, spec, conversion in Formatter().parse(text):
+            self.parts.append((literal, field, spec or "", conversion))
+        self.static = all(field is None for _literal, field, _spec, _conv in self.parts)
+
+    def render(self, values):
+        if self.static:
+            return self.text
+        out = []
+        for literal, field, spec, conversion in self.parts:
+            out.append(literal)
+            if field is not None:
+                value = values[field]
+                if conversion == "r":
+                    value = repr(value)
+                elif conversion == "s":
+                    value = str(value)
+                out.append(format(value, spec))
+        return "".join(out)
+
+
+class Catalog(Mapping):
+    def __init__(self, language, strings, fallback=None):
+        self.language = language
+        self.strings = strings
+        self.fallback = fallback
+        self._templates = {}
+        self._rendered = {}
+
+    def __getitem__(self, key):
+        try:
+            return self.strings[key]
+        except KeyError:
+            if self.fallback is None:
+                raise
+            return self.fallback[key]
+
+    def __iter__(self):
+        keys = set(self.strings)
+        if self.fallback is not None:
+            keys.update(self.fallback)
+        return iter(keys)
+
+    def __len__(self):
+        return sum(1 for _key in self)
+
+    def format(self, key, **values):
+        cache_key = (key, tuple(sorted(values.items())))
+        text = self._rendered.get(cache_key)
+        if text is None:
+            template = self._templates.get(key)
+            if template is None:
+                template = self._templates[key] = Template(self[key])
+            text = template.render(values)
+            if len(self._rendered) >= RENDER_CACHE_MAX:
+                self._rendered.clear()
+            self._rendered[cache_key] = text
+        return text
+
+
+class Localizer:
+    def __init__(self, language=DEFAULT_LANGUAGE, locale_dir=LOCALE_DIR):
+        self.locale_dir = locale_dir
+        self.catalogs = {}
+        self.language = language
+        self.current = self[language]
+
+    @property
+    def languages(self):
+        return available_languages(self.locale_dir)
+
+    def __getitem__(self, language):
+        catalog = self.catalogs.get(language)
+        if catalog is None:
+            with open(os.path.join(self.locale_dir, f"{language}.json"), "r", encoding="utf-8") as f:
+                strings = json.load(f)
+            # Keys missing from a translation fall back to the default language
+            fallback = None if language == DEFAULT_LANGUAGE else self[DEFAULT_LANGUAGE]
+            catalog = self.catalogs[language] = Catalog(language, strings, fallback)
+        return catalog
+
+    def set_language(self, language):
+        # Switch and return the keys whose text differs, so callers only touch those widgets
+        old = self.current
+        new = self[language]
+        self.language = language
+        self.current = new
+        return {key for key in new if new[key] != old.get(key)}
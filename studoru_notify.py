@@ -0,0 +1,64 @@
+import os
+import shutil
+import subprocess
+import sys
+from collections import deque
+
+# Phase-end notifications that never block the event loop: an in-window banner
+# queue (drawn by the app) plus an optional fire-and-forget desktop backend.
+DESKTOP_NOTIFY = os.environ.get("STUDORU_DESKTOP_NOTIFY", "0") == "1"
+BANNER_MS = 4000
+BANNER_MAX = 8
+
+
+class NullDesktopNotifier:
+    available = False
+
+    def notify(self, title, message):
+        pass
+
+
+class CommandDesktopNotifier:
+    # notify-send on Linux, osascript on macOS; spawned and never waited on
+    def __init__(self):
+        self.argv = None
+        if sys.platform == "darwin" and shutil.which("osascript"):
+            # Title and message go in as script arguments, so no AppleScript quoting
+            self.argv = lambda t, m: ["osascript", "-e", "on run argv",
+                                      "-e", "display notification (item 2 of argv) with title (item 1 of argv)",
+                                      "-e", "end run", t, m]
+        elif shutil.which("notify-send"):
+            self.argv = lambda t, m: ["notify-send", "--app-name=Studoru", t, m]
+        self.available = self.argv is not None
+
+    def notify(self, title, message):
+        if not self.available:
+            return
+        try:
+            subprocess.Popen(self.argv(title, message), stdin=subprocess.DEVNULL,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            self.available = False
+
+
+def desktop_notifier(enabled=DESKTOP_NOTIFY):
+    if enabled:
+        notifier = CommandDesktopNotifier()
+        if notifier.available:
+            return notifier
+    return NullDesktopNotifier()
+
+
+class BannerQueue:
+    # Pending banners; the oldest are dropped once more than BANNER_MAX pile up
+    def __init__(self, maxlen=BANNER_MAX):
+        self.pending = deque(maxlen=maxlen)
+        self.current = None
+
+    def push(self, title, message):
+        self.pending.append((title, message))
+
+    def advance(self):
+        # Next banner to show, or None when the queue is empty
+        self.current = self.pending.popleft() if self.pending else None
+        return self.current
@@ -0,0 +1,138 @@
+import functools
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+# Debug output goes to stderr when STUDORU_DEBUG=1
+DEBUG = os.environ.get("STUDORU_DEBUG") == "1"
+# Hot-path timers are on unless STUDORU_PROFILE=0, which leaves functions unwrapped
+PROFILE = os.environ.get("STUDORU_PROFILE", "1") == "1"
+TRACE_MAX = 20000
+
+
+def debug_log(msg):
+    if DEBUG:
+        print(f"[studoru] {msg}", file=sys.stderr)
+
+
+class StartupTrace:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks = []
+        self.imports = {}
+
+    def mark(self, name):
+        elapsed = time.perf_counter() - self.t0
+        self.marks.append((name, elapsed))
+        debug_log(f"startup {name}: {elapsed * 1000:.1f} ms")
+
+    def timed_import(self, name):
+        t0 = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports.setdefault(name, time.perf_counter() - t0)
+        return module
+
+    def report(self):
+        return {
+            "marks_ms": {name: round(t * 1000, 2) for name, t in self.marks},
+            "imports_ms": {name: round(t * 1000, 2) for name, t in self.imports.items()},
+        }
+
+
+class Profiler:
+    # Aggregates per name (count, total, max, last) plus a bounded event ring
+    # that can be exported in Chrome trace-event format (chrome://tracing, Perfetto).
+    def __init__(self, maxlen=TRACE_MAX):
+        self.t0 = time.perf_counter()
+        self.stats = {}
+        self.events = deque(maxlen=maxlen)
+        # record() also runs on the write-behind and render threads
+        self.lock = threading.Lock()
+
+    def record(self, name, start, duration, kind="X"):
+        with self.lock:
+            s = self.stats.get(name)
+            if s is None:
+                s = self.stats[name] = [0, 0.0, 0.0, 0.0]
+            s[0] += 1
+            s[1] += duration
+            if duration > s[2]:
+                s[2] = duration
+            s[3] = duration
+            self.events.append((kind, name, start, duration))
+
+    def sample(self, name, value):
+        # A measured value rather than a span, e.g. timer jitter in seconds
+        self.record(name, time.perf_counter(), value, "C")
+
+    def timed(self, name):
+        def wrap(fn):
+            if not PROFILE:
+                return fn
+
+            @functools.wraps(fn)
+            def timed_call(*args, **kwargs):
+                t0 = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, t0, time.perf_counter() - t0)
+            return timed_call
+        return wrap
+
+    def summary(self):
+        with self.lock:
+            stats = [(name, tuple(s)) for name, s in self.stats.items()]
+        return {name: {"count": n, "mean_ms": round(total / n * 1000, 3), "max_ms": round(peak * 1000, 3),
+                       "last_ms": round(last * 1000, 3)}
+                for name, (n, total, peak, last) in sorted(stats)}
+
+    def reset(self):
+        with self.lock:
+            self.stats.clear()
+            self.events.clear()
+
+    def export(self, path):
+        with self.lock:
+            events = list(self.events)
+        trace = []
+        for kind, name, start, value in events:
+            ts = (start - self.t0) * 1e6
+            if kind == "X":
+                trace.append({"name": name, "ph": "X", "ts": ts, "dur": value * 1e6, "pid": 1, "tid": 1})
+            else:
+                trace.append({"name": name, "ph": "C", "ts": ts, "pid": 1, "args": {"ms": value * 1000}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "otherData": {"summary": self.summary()}}, f)
+        return path
+
+
+PROFILER = Profiler()
+
+
+def importtime_report(modules):
+    # Cold import cost per module, measured in a fresh interpreter with -X importtime
+    report = {}
+    for name in modules:
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {name}"],
+                              capture_output=True, text=True)
+        cumulative = None
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            parts = [p.strip() for p in line[len("import time:"):].split("|")]
+            if len(parts) == 3 and parts[2] == name:
+                cumulative = int(parts[1])
+        report[name] = {"cumulative_us": cumulative, "ok": proc.returncode == 0}
+    return report
+
+
+if __name__ == "__main__":
+    mods = sys.argv[1:] or ["studoru_core", "ttkbootstrap", "matplotlib.figure",
+                            "matplotlib.backends.backend_tkagg", "matplotlib.pyplot"]
+    print(json.dumps(importtime_report(mods), indent=2))
@@ -0,0 +1,44 @@
+import os
+import re
+
+# Per-profile data directories, so several students can share one machine.
+# The "default" profile keeps using the files in the working directory; every
+# other profile gets its own folder under PROFILES_DIR with the same file names.
+STATS_FILE = "studoru_stats.json"
+SCHEDULE_FILE = "studoru_schedule.json"
+STATS_DB_FILE = "studoru_stats.db"
+PROFILES_DIR = os.environ.get("STUDORU_PROFILES_DIR", "studoru_profiles")
+DEFAULT_PROFILE = "default"
+# Profile opened at startup
+ACTIVE_PROFILE = os.environ.get("STUDORU_USER", DEFAULT_PROFILE)
+PROFILE_NAME = re.compile(r"[\w-]{1,40}")
+
+
+def validate_profile(name):
+    if not PROFILE_NAME.fullmatch(name or ""):
+        raise ValueError(f"invalid profile name: {name!r}")
+    return name
+
+
+def profile_dir(name, root=PROFILES_DIR):
+    validate_profile(name)
+    return "" if name == DEFAULT_PROFILE else os.path.join(root, name)
+
+
+def profile_paths(name, root=PROFILES_DIR):
+    base = profile_dir(name, root)
+    if base:
+        os.makedirs(base, exist_ok=True)
+    return {"stats_path": os.path.join(base, STATS_FILE),
+            "schedule_path": os.path.join(base, SCHEDULE_FILE),
+            "db_path": os.path.join(base, STATS_DB_FILE)}
+
+
+def list_profiles(root=PROFILES_DIR):
+    # Directory names only; no profile data is read
+    try:
+        names = sorted(entry.name for entry in os.scandir(root)
+                       if entry.is_dir() and PROFILE_NAME.fullmatch(entry.name) and entry.name != DEFAULT_PROFILE)
+    except OSError:
+        names = []
+    return [DEFAULT_PROFILE] + names
@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+
+from studoru_storage import load_json, atomic_save_json
+
+# Week/month/year aggregates kept next to the stats file. A range total is the
+# sum of a few whole-period buckets plus at most a handful of edge days; the
+# edge days come from the index's own per-day totals, so a range query never
+# has to read the history itself.
+ROLLUP_SUFFIX = ".rollups"
+LEVELS = ("year", "month", "week")
+
+
+def period_key(level, d):
+    if level == "year":
+        return f"{d.year:04d}"
+    if level == "month":
+        return f"{d.year:04d}-{d.month:02d}"
+    iso = d.isocalendar()
+    return f"{iso[0]:04d}-W{iso[1]:02d}"
+
+
+def period_end(level, d):
+    if level == "year":
+        return date(d.year, 12, 31)
+    if level == "month":
+        first_next = date(d.year + d.month // 12, d.month % 12 + 1, 1)
+        return first_next - timedelta(days=1)
+    return d + timedelta(days=6 - d.weekday())
+
+
+def day_totals(day):
+    # Day counters when present, otherwise rebuilt from the raw details
+    details = day.get("details", [])
+    if "total_focus_sec" in day:
+        return day["total_focus_sec"], day.get("sessions", len(details)), day.get("longest_sec", 0)
+    seconds = [d["sec"] if "sec" in d else d.get("duration_min", 0) * 60 for d in details]
+    return sum(seconds), len(seconds), max(seconds, default=0)
+
+
+class RollupIndex:
+    def __init__(self):
+        self.levels = {level: {} for level in LEVELS}
+        # day_key -> [total_focus_sec, sessions, longest_sec]
+        self.days = {}
+        # Store write position (journal seq / last session id) this index reflects
+        self.position = 0
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        data = load_json(path, {})
+        # Files written before the per-day totals existed are rebuilt once
+        index.position = data.get("position", -1) if data and "days" in data else -1
+        for level in LEVELS:
+            index.levels[level] = data.get(level, {})
+        index.days = data.get("days", {})
+        return index
+
+    def save(self, path):
+        data = {"position": self.position, "days": self.days}
+        data.update(self.levels)
+        atomic_save_json(path, data)
+
+    def add(self, day_key, seconds, sessions=1, longest=None):
+        longest = seconds if longest is None else longest
+        day = self.days.setdefault(day_key, [0, 0, 0])
+        day[0] += seconds
+        day[1] += sessions
+        day[2] = max(day[2], longest)
+        d = date.fromisoformat(day_key)
+        for level in LEVELS:
+            bucket = self.levels[level].setdefault(period_key(level, d), {
+                "total_focus_sec": 0, "sessions": 0, "longest_sec": 0, "first_day": day_key, "last_day": day_key})
+            bucket["total_focus_sec"] += seconds
+            bucket["sessions"] += sessions
+            bucket["longest_sec"] = max(bucket["longest_sec"], longest)
+            bucket["first_day"] = min(bucket["first_day"], day_key)
+            bucket["last_day"] = max(bucket["last_day"], day_key)
+
+    def rebuild(self, stats):
+        self.levels = {level: {} for level in LEVELS}
+        self.days = {}
+        for day_key in sorted(k for k in stats if len(k) == 10 and k[4] == "-"):
+            total, sessions, longest = day_totals(stats[day_key])
+            if sessions:
+                self.add(day_key, total, sessions, longest)
+
+    def range_totals(self, start_key, end_key):
+        # Greedy walk: the largest bucket whose data lies inside [d, end] wins;
+        # a missing bucket means the whole period is empty and is skipped
+        result = {"total_focus_sec": 0, "sessions": 0, "longest_sec": 0}
+        d = date.fromisoformat(start_key)
+        end = date.fromisoformat(end_key)
+        while d <= end:
+            for level in LEVELS:
+                bucket = self.levels[level].get(period_key(level, d))
+                if bucket is not None and not (bucket["first_day"] >= d.isoformat()
+                                               and bucket["last_day"] <= end_key):
+                    continue
+                if bucket is not None:
+                    result["total_focus_sec"] += bucket["total_focus_sec"]
+                    result["sessions"] += bucket["sessions"]
+                    result["longest_sec"] = max(result["longest_sec"], bucket["longest_sec"])
+                d = min(period_end(level, d), end) + timedelta(days=1)
+                break
+            else:
+                day = self.days.get(d.isoformat())
+                if day:
+                    total, sessions, longest = day
+                    result["total_focus_sec"] += total
+                    result["sessions"] += sessions
+                    result["longest_sec"] = max(result["longest_sec"], longest)
+                d += timedelta(days=1)
+        return result
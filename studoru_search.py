@@ -0,0 +1,64 @@
+from bisect import bisect_left, insort
+
+# Type-ahead index over preset names: sorted names for prefix lookups and a
+# trigram -> ids map for substring queries of three or more characters.
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    def __init__(self, items=()):
+        self.sorted_names = []
+        self.grams = {}
+        self.names = {}
+        for item_id, name in items:
+            self.add(item_id, name)
+
+    def add(self, item_id, name):
+        key = name.casefold()
+        self.names[item_id] = key
+        insort(self.sorted_names, (key, item_id))
+        for gram in trigrams(key):
+            self.grams.setdefault(gram, set()).add(item_id)
+
+    def remove(self, item_id):
+        key = self.names.pop(item_id, None)
+        if key is None:
+            return
+        i = bisect_left(self.sorted_names, (key, item_id))
+        if i < len(self.sorted_names) and self.sorted_names[i] == (key, item_id):
+            del self.sorted_names[i]
+        for gram in trigrams(key):
+            ids = self.grams.get(gram)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del self.grams[gram]
+
+    def prefix(self, query, limit=None):
+        out = []
+        i = bisect_left(self.sorted_names, (query,))
+        while i < len(self.sorted_names) and self.sorted_names[i][0].startswith(query):
+            out.append(self.sorted_names[i][1])
+            if limit is not None and len(out) >= limit:
+                break
+            i += 1
+        return out
+
+    def search(self, query, limit=None):
+        # Prefix matches first (alphabetical), then other substring matches
+        query = query.strip().casefold()
+        if not query:
+            return None
+        hits = self.prefix(query, limit)
+        if len(query) < 3 or (limit is not None and len(hits) >= limit):
+            return hits
+        sets = sorted((self.grams.get(g, set()) for g in trigrams(query)), key=len)
+        candidates = set.intersection(*sets) if sets else set()
+        seen = set(hits)
+        rest = sorted((self.names[i], i) for i in candidates
+                      if i not in seen and query in self.names[i])
+        hits.extend(i for _name, i in rest)
+        return hits[:limit] if limit is not None else hits
@@ -0,0 +1,135 @@
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+
+from studoru_calendar import day_key, next_midnight
+
+# One focus session at second resolution: wall-clock start and end (epoch
+# seconds), active seconds and the pauses in between. Records use __slots__
+# and sessions without pauses all share one empty tuple. In the stats JSON a
+# session keeps its legacy fields (name, duration_min, "HH:MM" time) and adds
+# start/end/sec[/pauses], so older readers keep working. Legacy details stay
+# as they were written; readers fall back to their whole minutes and "HH:MM".
+NO_PAUSES = ()
+DETAIL_KEYS = ("name", "duration_min", "time", "start", "end", "sec", "pauses")
+DETAIL_KEY_SET = frozenset(DETAIL_KEYS)
+
+
+class SessionRecord:
+    __slots__ = ("start", "end", "active", "pauses")
+
+    def __init__(self, start, end, active=None, pauses=NO_PAUSES):
+        self.start = int(start)
+        self.end = int(end)
+        self.pauses = tuple((int(s), int(e)) for s, e in pauses) if pauses else NO_PAUSES
+        self.active = self.end - self.start - self.paused if active is None else int(active)
+
+    @classmethod
+    def ending_at(cls, end, active, pauses=NO_PAUSES):
+        # The timer knows when a session ended and how long it ran unpaused
+        record = cls(end, end, active, pauses)
+        record.start = record.end - record.active - record.paused
+        return record
+
+    @classmethod
+    def from_fields(cls, fields):
+        # Journal line or detail dict with start/end; None for legacy entries
+        if "start" not in fields:
+            return None
+        return cls(fields["start"], fields["end"], fields.get("sec"), fields.get("pauses") or NO_PAUSES)
+
+    def __repr__(self):
+        return f"SessionRecord(start={self.start}, end={self.end}, active={self.active}, pauses={self.pauses!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, SessionRecord):
+            return NotImplemented
+        return (self.start, self.end, self.active, self.pauses) == (other.start, other.end, other.active, other.pauses)
+
+    @property
+    def paused(self):
+        return sum(e - s for s, e in self.pauses)
+
+    def to_fields(self):
+        fields = {"start": self.start, "end": self.end, "sec": self.active}
+        if self.pauses:
+            fields["pauses"] = [list(p) for p in self.pauses]
+        return fields
+
+    def split(self):
+        # [(day_key, record, "HH:MM")] oldest first, one piece per calendar day
+        # the session touched. Pieces are cut at local midnight with their pauses
+        # clipped; active seconds always add up to the whole session's. A piece
+        # cut at midnight is stamped "23:59" on its own day.
+        start = datetime.fromtimestamp(self.start)
+        end = datetime.fromtimestamp(self.end)
+        pieces = []
+        cursor = start
+        while True:
+            boundary = next_midnight(cursor)
+            if boundary >= end:
+                break
+            cut = boundary.timestamp()
+            lo = cursor.timestamp()
+            pauses = [(max(s, lo), min(e, cut)) for s, e in self.pauses if s < cut and e > lo]
+            piece = SessionRecord(lo, cut, pauses=pauses)
+            if piece.active > 0:
+                pieces.append((day_key(cursor), piece, "23:59"))
+            cursor = boundary
+        lo = cursor.timestamp()
+        done = sum(piece.active for _key, piece, _time in pieces)
+        pauses = [(max(s, lo), e) for s, e in self.pauses if e > lo]
+        last = SessionRecord(lo, self.end, self.active - done, pauses)
+        if last.active > 0 or not pieces:
+            # A session ending exactly at midnight still belongs to the day before
+            pieces.append((day_key(cursor), last, end.strftime("%H:%M") if boundary > end else "23:59"))
+        return pieces
+
+
+class SessionDetail(Mapping):
+    # Resident form of one "details" entry: reads like the JSON dict it is
+    # written back as, but slotted, with names and "HH:MM" strings interned.
+    # Fields a legacy entry lacks are None and are not keys.
+    __slots__ = DETAIL_KEYS
+
+    def __init__(self, name, duration_min, time=None, start=None, end=None, sec=None, pauses=NO_PAUSES):
+        self.name = sys.intern(name)
+        self.duration_min = duration_min
+        self.time = None if time is None else sys.intern(time)
+        self.start = start
+        self.end = end
+        self.sec = sec
+        self.pauses = tuple((int(s), int(e)) for s, e in pauses) if pauses else NO_PAUSES
+
+    @classmethod
+    def from_dict(cls, detail):
+        # Entries that would not write back identically (fields of their own,
+        # nulls, an empty pause list, odd types) stay plain dicts
+        if (type(detail) is dict and detail.keys() <= DETAIL_KEY_SET
+                and None not in detail.values() and detail.get("pauses", True)):
+            try:
+                return cls(**detail)
+            except (TypeError, ValueError):
+                pass
+        return detail
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        value = getattr(self, key)
+        return [list(p) for p in value] if key == "pauses" else value
+
+    def __contains__(self, key):
+        if key not in DETAIL_KEY_SET:
+            return False
+        value = getattr(self, key)
+        return value is not None and value is not NO_PAUSES
+
+    def __iter__(self):
+        return (key for key in DETAIL_KEYS if key in self)
+
+    def __len__(self):
+        return sum(1 for _key in self)
+
+    def __repr__(self):
+        return f"SessionDetail({dict(self)!r})"
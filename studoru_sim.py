@@ -0,0 +1,160 @@
+import json
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, time, timedelta
+
+from studoru_core import StudoruCore, build_timeline
+from studoru_timer import WORK
+
+# Offline simulation: the core runs against a virtual clock, so hours of timer
+# activity (or years of history) take milliseconds instead of wall-clock time.
+# python studoru_sim.py [days] [data_dir]
+SIM_START = datetime(2024, 1, 1, 9, 0)
+ACTIONS = ["start", "pause", "resume", "stop", "reset", "advance", "record"]
+
+
+class SimClock:
+    # One virtual time source for both the monotonic timer clock and now()
+    def __init__(self, start=SIM_START):
+        self.start = start
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+    def now(self):
+        return self.start + timedelta(seconds=self.t)
+
+    def advance(self, seconds):
+        self.t += seconds
+
+    def jump_to(self, when):
+        self.t = max(self.t, (when - self.start).total_seconds())
+
+
+class Simulation:
+    def __init__(self, data_dir=None, start=SIM_START, backend="json", timeline=None):
+        if data_dir is None:
+            self._tmp = tempfile.TemporaryDirectory(prefix="studoru-sim-")
+            data_dir = self._tmp.name
+        os.makedirs(data_dir, exist_ok=True)
+        self.data_dir = data_dir
+        self.backend = backend
+        self.clock = SimClock(start)
+        self.timeline = timeline or build_timeline(25, 5, "minutes")
+        self.events = []
+        self.core = None
+        self.open()
+
+    def open(self):
+        # Same construction path as the app, minus the writer thread
+        self.core = StudoruCore(stats_path=os.path.join(self.data_dir, "studoru_stats.json"),
+                                schedule_path=os.path.join(self.data_dir, "studoru_schedule.json"),
+                                db_path=os.path.join(self.data_dir, "studoru_stats.db"),
+                                backend=self.backend, write_behind=False,
+                                clock=self.clock, now=self.clock.now)
+        return self.core
+
+    def close(self):
+        if self.core is not None:
+            self.core.close()
+            self.core = None
+
+    # Controls, mirroring the app's buttons
+    def start(self, timeline=None):
+        self.core.start_program(timeline or self.timeline)
+
+    def pause(self):
+        self.core.pause()
+
+    def resume(self):
+        self.core.resume()
+
+    def stop(self):
+        self.core.stop()
+
+    def reset(self):
+        self.core.reset(self.timeline)
+
+    def record(self, seconds):
+        return self.core.record_focus_session(seconds)
+
+    def advance(self, seconds, tick=None):
+        # One poll catches up every boundary; tick polls at a fixed cadence like the UI
+        events = []
+        if tick is None:
+            self.clock.advance(seconds)
+            events.extend(event for event, _segments in self.core.poll())
+        else:
+            left = seconds
+            while left > 0:
+                step = min(tick, left)
+                self.clock.advance(step)
+                events.extend(event for event, _segments in self.core.poll())
+                left -= step
+        self.events.extend(events)
+        return events
+
+    def run_phases(self, n):
+        # Advance exactly n phase boundaries from the current position
+        events = []
+        for _ in range(n):
+            events.extend(self.advance(self.core.timer.remaining()))
+        return events
+
+    def run_script(self, actions):
+        # actions: (name, arg) pairs from ACTIONS; arg is seconds for advance/record
+        for name, arg in actions:
+            if name == "advance":
+                self.advance(arg)
+            elif name == "record":
+                self.record(arg)
+            else:
+                getattr(self, name)()
+        return self.events
+
+    def simulate_days(self, n_days, work_sessions=4, day_start_hour=9, rng=None):
+        # One app run per day: open, walk the program for a few study phases, close
+        first = datetime.combine(self.clock.now().date(), time(day_start_hour))
+        if first < self.clock.now():
+            first += timedelta(days=1)
+        for i in range(n_days):
+            self.clock.jump_to(first + timedelta(days=i))
+            if self.core is None:
+                self.open()
+            sessions = work_sessions if rng is None else rng.randint(0, work_sessions)
+            self.start()
+            done = 0
+            while done < sessions:
+                done += sum(1 for e in self.run_phases(1) if e.phase == WORK)
+            self.stop()
+            self.close()
+        return self
+
+
+def random_script(rng, steps, max_advance=3600):
+    script = []
+    for _ in range(steps):
+        name = rng.choice(ACTIONS)
+        arg = rng.uniform(0, max_advance) if name == "advance" else rng.randint(1, 7200) if name == "record" else None
+        script.append((name, arg))
+    return script
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_days = int(argv[0]) if argv else 365
+    data_dir = argv[1] if len(argv) > 1 else None
+    sim = Simulation(data_dir)
+    sim.simulate_days(n_days, rng=random.Random(0))
+    core = sim.open()
+    print(json.dumps({"days": n_days, "data_dir": data_dir, "events": len(sim.events),
+                      "sim_seconds": sim.clock.t, "totals": core.range_totals(
+                          SIM_START.date().isoformat(), core.today_key)}, indent=2))
+    sim.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,785 @@
+import json
+import os
+import re
+import threading
+import time
+from collections.abc import Mapping, MutableMapping
+from contextlib import nullcontext
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from studoru_perf import PROFILER, debug_log
+from studoru_sessions import SessionRecord, SessionDetail, NO_PAUSES
+
+# Snapshot + append-only journal for the stats history.
+# The snapshot is the regular stats JSON file; every finished session is
+# appended to "<stats>.journal" as one compact line and replayed on startup.
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_SEQ_KEY = "_journal_seq"
+COMPACT_EVERY = 200
+TAIL_CHUNK = 64 * 1024
+TAIL_DAY_LINE = re.compile(rb'\n  "(\d{4}-\d{2}-\d{2})": \{')
+TAIL_SEQ_LINE = re.compile(rb'"%s": (\d+)\s*\}\s*$' % JOURNAL_SEQ_KEY.encode())
+# Advisory lock file guarding a snapshot + journal pair shared by several app instances
+LOCK_SUFFIX = ".lock"
+LOCK_TIMEOUT = 10.0
+JOURNAL_TAIL = 4096
+
+
+def load_json(path, default):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return default
+    return default
+
+
+def json_default(obj):
+    # Resident session details are written as the plain dicts they stand for
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+@PROFILER.timed("save_json")
+def save_json(path, data):
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
+    except Exception:
+        pass
+
+
+@PROFILER.timed("atomic_save_json")
+def atomic_save_json(path, data):
+    # Write to a temp file in the same directory, fsync, then rename over the target
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, default=json_default)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_tail_day(path, day_key):
+    # Compacted snapshots have sorted day keys and end with the journal sequence,
+    # so the newest day can be decoded from the file tail without a full parse.
+    # Returns (ok, bucket_or_None, seq); ok=False means the caller must parse it all.
+    if not os.path.exists(path):
+        return True, None, 0
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        chunk = TAIL_CHUNK
+        while True:
+            start = max(0, size - chunk)
+            f.seek(start)
+            tail = f.read()
+            seq_match = TAIL_SEQ_LINE.search(tail)
+            if seq_match is None:
+                return False, None, None
+            matches = list(TAIL_DAY_LINE.finditer(tail))
+            if matches or start == 0:
+                break
+            chunk *= 2
+    seq = int(seq_match.group(1))
+    if not matches:
+        return True, None, seq
+    last = matches[-1]
+    last_key = last.group(1).decode()
+    if last_key > day_key:
+        return False, None, None
+    if last_key < day_key:
+        return True, None, seq
+    bucket, _end = json.JSONDecoder().raw_decode(tail[last.end() - 1:].decode("utf-8"))
+    return True, compact_details(bucket), seq
+
+
+class FileLock:
+    # Exclusive advisory lock on "<path>.lock"; re-entrant within one instance
+    def __init__(self, path, timeout=LOCK_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._fd = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()
+
+    @staticmethod
+    def _try_lock(fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    @staticmethod
+    def _unlock(fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            deadline = time.monotonic() + self.timeout
+            while True:
+                try:
+                    self._try_lock(fd)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        os.close(fd)
+                        self._thread_lock.release()
+                        raise TimeoutError(f"{self.path} is locked by another instance")
+                    time.sleep(0.05)
+            self._fd = fd
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def read_snapshot_seq(path):
+    # Journal sequence stored at the end of a compacted snapshot (0 if none)
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 256))
+        match = TAIL_SEQ_LINE.search(f.read())
+    return int(match.group(1)) if match else 0
+
+
+def read_journal_tail(path):
+    # (last sequence number, ends with newline) from the last few KB of a journal
+    if not os.path.exists(path):
+        return 0, True
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - JOURNAL_TAIL))
+        tail = f.read()
+    for line in reversed(tail.splitlines()):
+        try:
+            return int(json.loads(line)["seq"]), tail.endswith(b"\n")
+        except (ValueError, KeyError, TypeError):
+            continue
+    return 0, not tail or tail.endswith(b"\n")
+
+
+def compact_details(day):
+    # Swap the detail dicts json.load produced for slotted SessionDetail records
+    if isinstance(day, dict) and isinstance(day.get("details"), list):
+        day["details"] = [SessionDetail.from_dict(d) for d in day["details"]]
+    return day
+
+
+def empty_day():
+    return {"total_focus_sec": 0, "sessions": 0, "longest_sec": 0, "details": []}
+
+
+def apply_session(stats, day_key, seconds, time_str, record=None):
+    # record (a SessionRecord) adds start/end/sec[/pauses] next to the legacy fields
+    day = stats.setdefault(day_key, empty_day())
+    day.setdefault("details", [])
+    day["total_focus_sec"] += seconds
+    day["sessions"] += 1
+    day["longest_sec"] = max(day["longest_sec"], seconds)
+    if record is None:
+        detail = SessionDetail(f"Session {day['sessions']}", seconds // 60, time_str)
+    else:
+        detail = SessionDetail(f"Session {day['sessions']}", seconds // 60, time_str,
+                               record.start, record.end, record.active, record.pauses)
+    day["details"].append(detail)
+    return day
+
+
+class SessionJournal:
+    # shared=True: other processes may use the same files. Writes then take the
+    # lock, continue the on-disk sequence, and compaction merges from disk.
+    def __init__(self, snapshot_path, journal_path=None, compact_every=COMPACT_EVERY, shared=False):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or snapshot_path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.lock = FileLock(snapshot_path + LOCK_SUFFIX) if shared else None
+        self.seq = 0
+        self.pending = 0
+        self.needs_newline = False
+        # Set when another instance wrote since our last load
+        self.merged = False
+
+    def locked(self):
+        return self.lock if self.lock is not None else nullcontext()
+
+    def disk_seq(self):
+        return max(read_snapshot_seq(self.snapshot_path), read_journal_tail(self.journal_path)[0])
+
+    def load(self):
+        with self.locked():
+            return self._load()
+
+    def _load(self):
+        stats = load_json(self.snapshot_path, {})
+        self.seq = stats.pop(JOURNAL_SEQ_KEY, 0)
+        for day in stats.values():
+            compact_details(day)
+        self.pending = 0
+        self.merged = False
+        for record in self._read_records():
+            # Records already folded into the snapshot survive a crash between
+            # snapshot rename and journal truncation; skip them by sequence
+            if record["seq"] <= self.seq:
+                continue
+            apply_session(stats, record["day"], record["sec"], record["time"], record["record"])
+            self.seq = record["seq"]
+            self.pending += 1
+        return stats
+
+    def load_day(self, day_key):
+        # Eager single-day load: snapshot tail + journal records for that day.
+        # Raises LookupError when the snapshot is not in compacted (sorted) form.
+        with self.locked():
+            ok, bucket, seq = read_tail_day(self.snapshot_path, day_key)
+            if not ok:
+                raise LookupError(self.snapshot_path)
+            days = {day_key: bucket} if bucket is not None else {}
+            self.seq = seq
+            self.pending = 0
+            self.merged = False
+            for record in self._read_records():
+                if record["seq"] <= self.seq:
+                    continue
+                if record["day"] == day_key:
+                    apply_session(days, day_key, record["sec"], record["time"], record["record"])
+                self.seq = record["seq"]
+                self.pending += 1
+        return days.get(day_key)
+
+    def _read_records(self):
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                # A torn tail has no newline; the next append must start a fresh line
+                self.needs_newline = not line.endswith("\n")
+                try:
+                    record = json.loads(line)
+                    yield {"seq": int(record["seq"]), "day": record["day"], "sec": int(record["sec"]),
+                           "time": record["time"], "record": SessionRecord.from_fields(record)}
+                except (ValueError, KeyError, TypeError):
+                    # Torn tail from an interrupted append
+                    continue
+
+    @PROFILER.timed("journal_append")
+    def append(self, day_key, seconds, time_str, record=None):
+        self.append_many([(day_key, seconds, time_str, record)])
+
+    def append_many(self, records):
+        # One write and one fsync for the whole batch
+        with self.locked():
+            if self.lock is not None:
+                # Continue after whatever other instances appended or compacted
+                disk_seq = max(read_snapshot_seq(self.snapshot_path), self.seq)
+                last_seq, ends_clean = read_journal_tail(self.journal_path)
+                disk_seq = max(disk_seq, last_seq)
+                if disk_seq > self.seq:
+                    self.merged = True
+                    self.seq = disk_seq
+                self.needs_newline = not ends_clean
+            lines = []
+            for day_key, seconds, time_str, record in records:
+                self.seq += 1
+                line = {"seq": self.seq, "day": day_key, "sec": seconds, "time": time_str}
+                if record is not None:
+                    line.update(record.to_fields())
+                lines.append(json.dumps(line, ensure_ascii=False, separators=(",", ":")))
+            text = "\n".join(lines) + "\n"
+            if self.needs_newline:
+                text = "\n" + text
+                self.needs_newline = False
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending += len(records)
+
+    def should_compact(self):
+        return self.pending >= self.compact_every
+
+    def position(self):
+        return self.seq
+
+    @PROFILER.timed("journal_compact")
+    def compact(self, stats=None):
+        # Without in-memory stats, rebuild from disk: snapshot + journal replay.
+        # Shared files always take that path: the caller's stats never see other
+        # instances' sessions, even after a merge, so they must not be written.
+        with self.locked():
+            if stats is None or self.lock is not None:
+                foreign = self.lock is not None and (self.merged or self.disk_seq() != self.seq)
+                if not self.pending and not foreign:
+                    return
+                stats = self._load()
+            snapshot = dict(sorted(stats.items()))
+            snapshot[JOURNAL_SEQ_KEY] = self.seq
+            atomic_save_json(self.snapshot_path, snapshot)
+            with open(self.journal_path, "w", encoding="utf-8") as f:
+                f.flush()
+                os.fsync(f.fileno())
+            self.pending = 0
+            self.needs_newline = False
+
+
+class OpLog:
+    # Generic append-only log of JSON ops next to a snapshot file. Ops must be
+    # idempotent, so replaying ones already folded into the snapshot is harmless.
+    def __init__(self, snapshot_path, compact_every=COMPACT_EVERY, shared=False):
+        self.snapshot_path = snapshot_path
+        self.log_path = snapshot_path + JOURNAL_SUFFIX
+        self.compact_every = compact_every
+        self.lock = FileLock(snapshot_path + LOCK_SUFFIX) if shared else None
+        self.pending = 0
+
+    def locked(self):
+        return self.lock if self.lock is not None else nullcontext()
+
+    def read(self):
+        ops = []
+        if os.path.exists(self.log_path):
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        ops.append(json.loads(line))
+                    except ValueError:
+                        continue
+        self.pending = len(ops)
+        return ops
+
+    def append(self, op):
+        line = json.dumps(op, ensure_ascii=False, separators=(",", ":"))
+        with self.locked(), open(self.log_path, "a", encoding="utf-8") as f:
+            # Leading newline isolates a torn tail left by a crash; blank lines are skipped
+            f.write("\n" + line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending += 1
+
+    def should_compact(self):
+        return self.pending >= self.compact_every
+
+    def compact(self, snapshot):
+        with self.locked():
+            atomic_save_json(self.snapshot_path, snapshot)
+            with open(self.log_path, "w", encoding="utf-8") as f:
+                f.flush()
+                os.fsync(f.fileno())
+        self.pending = 0
+
+
+# Optional SQLite backend: one row per session plus a per-day aggregate row.
+# Both tables are keyed/indexed by the "%Y-%m-%d" day string, so date-range
+# reads are an index seek plus a scan of the matching rows only.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT PRIMARY KEY,
+    total_focus_sec INTEGER NOT NULL DEFAULT 0,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    longest_sec INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,
+    name TEXT NOT NULL,
+    duration_sec INTEGER,
+    duration_min INTEGER NOT NULL,
+    time TEXT NOT NULL,
+    start_ts INTEGER,
+    end_ts INTEGER,
+    pauses TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions(day, id);
+"""
+
+SESSION_RECORD_COLUMNS = [("start_ts", "INTEGER"), ("end_ts", "INTEGER"), ("pauses", "TEXT")]
+
+
+def record_columns(record):
+    # (start_ts, end_ts, pauses) for a session row; NULLs for legacy sessions
+    if record is None:
+        return None, None, None
+    pauses = json.dumps([list(p) for p in record.pauses], separators=(",", ":")) if record.pauses else None
+    return record.start, record.end, pauses
+
+
+class SqliteStatsStore:
+    def __init__(self, path):
+        self.path = path
+        self.pending = 0
+        # One connection per thread; WAL lets the UI read while a writer thread commits
+        self._local = threading.local()
+        self.conn.executescript(SQLITE_SCHEMA)
+        # Databases from before second-resolution records lack the timestamp columns
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(sessions)")}
+        with self.conn:
+            for column, kind in SESSION_RECORD_COLUMNS:
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE sessions ADD COLUMN {column} {kind}")
+
+    @property
+    def conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import sqlite3
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def is_empty(self):
+        return self.conn.execute("SELECT 1 FROM daily LIMIT 1").fetchone() is None
+
+    def migrate_from_json(self, json_path):
+        # One-shot import of the legacy stats file; no-op once the database has data
+        if not self.is_empty():
+            return 0
+        stats = SessionJournal(json_path).load()
+        with self.conn:
+            for day_key, day in stats.items():
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO daily VALUES (?, ?, ?, ?)",
+                    (day_key, day.get("total_focus_sec", 0), day.get("sessions", 0), day.get("longest_sec", 0)))
+                self.conn.executemany(
+                    "INSERT INTO sessions (day, name, duration_sec, duration_min, time, start_ts, end_ts, pauses) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(day_key, d.get("name", ""), d.get("sec"), d.get("duration_min", 0), d.get("time", ""))
+                     + record_columns(SessionRecord.from_fields(d)) for d in day.get("details", [])])
+        return len(stats)
+
+    @PROFILER.timed("sqlite_append")
+    def append(self, day_key, seconds, time_str, record=None):
+        self.append_many([(day_key, seconds, time_str, record)])
+
+    def append_many(self, records):
+        # One transaction for the whole batch
+        conn = self.conn
+        with conn:
+            for day_key, seconds, time_str, record in records:
+                conn.execute(
+                    "INSERT INTO daily (day, total_focus_sec, sessions, longest_sec) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT(day) DO UPDATE SET total_focus_sec = total_focus_sec + excluded.total_focus_sec, "
+                    "sessions = sessions + 1, longest_sec = MAX(longest_sec, excluded.longest_sec)",
+                    (day_key, seconds, seconds))
+                count = conn.execute("SELECT sessions FROM daily WHERE day = ?", (day_key,)).fetchone()[0]
+                conn.execute(
+                    "INSERT INTO sessions (day, name, duration_sec, duration_min, time, start_ts, end_ts, pauses) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (day_key, f"Session {count}", seconds, seconds // 60, time_str) + record_columns(record))
+
+    # Same surface as SessionJournal so the app can swap backends
+    def should_compact(self):
+        return False
+
+    def position(self):
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM sessions").fetchone()[0]
+
+    def compact(self, _stats=None):
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def load(self, since=None):
+        return self.range_days(since or "0000-00-00", "9999-99-99")
+
+    def get_day(self, day_key):
+        return self.range_days(day_key, day_key).get(day_key, empty_day())
+
+    def load_day(self, day_key):
+        return self.range_days(day_key, day_key).get(day_key)
+
+    def range_days(self, start_key, end_key):
+        days = {}
+        for day_key, total, sessions, longest in self.conn.execute(
+                "SELECT day, total_focus_sec, sessions, longest_sec FROM daily "
+                "WHERE day BETWEEN ? AND ? ORDER BY day", (start_key, end_key)):
+            days[day_key] = {"total_focus_sec": total, "sessions": sessions, "longest_sec": longest, "details": []}
+        for day_key, name, duration_sec, duration_min, time_str, start_ts, end_ts, pauses in self.conn.execute(
+                "SELECT day, name, duration_sec, duration_min, time, start_ts, end_ts, pauses FROM sessions "
+                "WHERE day BETWEEN ? AND ? ORDER BY day, id", (start_key, end_key)):
+            if start_ts is None:
+                detail = SessionDetail(name, duration_min, time_str)
+            else:
+                detail = SessionDetail(name, duration_min, time_str, start_ts, end_ts, duration_sec,
+                                       json.loads(pauses) if pauses else NO_PAUSES)
+            days.setdefault(day_key, empty_day())["details"].append(detail)
+        return days
+
+    def range_totals(self, start_key, end_key):
+        total, sessions, longest = self.conn.execute(
+            "SELECT COALESCE(SUM(total_focus_sec), 0), COALESCE(SUM(sessions), 0), COALESCE(MAX(longest_sec), 0) "
+            "FROM daily WHERE day BETWEEN ? AND ?", (start_key, end_key)).fetchone()
+        return {"total_focus_sec": total, "sessions": sessions, "longest_sec": longest}
+
+    def last_days(self, n, today_key):
+        from datetime import date, timedelta
+        start = (date.fromisoformat(today_key) - timedelta(days=n - 1)).isoformat()
+        return self.range_days(start, today_key)
+
+    def export_json(self, json_path):
+        save_json(json_path, self.load())
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+WRITE_RETRIES = 3
+# Seconds between retries of records that failed to reach the disk
+WRITE_RETRY_INTERVAL = 5.0
+
+
+class WriteBehindStore:
+    # Wraps a journal or SQLite store so appends and compactions run on a
+    # background thread. Callers only enqueue; the writer drains whatever has
+    # piled up as one batch (a single fsync/transaction for all appends, at
+    # most one compaction), so a slow disk never stalls the timer. Records
+    # that still fail after WRITE_RETRIES stay queued and are retried with the
+    # next batch, every WRITE_RETRY_INTERVAL and on close; `error` holds the
+    # last failure until a write succeeds again.
+    def __init__(self, store):
+        self.store = store
+        self.errors = 0
+        self.error = None
+        self._failed = []
+        self.io_lock = threading.RLock()
+        self._cond = threading.Condition()
+        self._ops = []
+        self._busy = False
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="studoru-writer", daemon=True)
+        self._thread.start()
+
+    # Reads wait for queued writes, then go straight to the store
+    def load(self, *args, **kwargs):
+        self.flush()
+        with self.io_lock:
+            return self.store.load(*args, **kwargs)
+
+    def load_day(self, day_key):
+        self.flush()
+        with self.io_lock:
+            return self.store.load_day(day_key)
+
+    def __getattr__(self, name):
+        # Read-only extras such as range_days/range_totals on the SQLite store
+        attr = getattr(self.store, name)
+        if not callable(attr):
+            return attr
+
+        def locked(*args, **kwargs):
+            self.flush()
+            with self.io_lock:
+                return attr(*args, **kwargs)
+        return locked
+
+    def _submit(self, op):
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("write-behind store is closed")
+            self._ops.append(op)
+            self._cond.notify()
+
+    def append(self, day_key, seconds, time_str, record=None):
+        self._submit(("append", (day_key, seconds, time_str, record)))
+
+    def should_compact(self):
+        # The writer compacts on its own once the journal grows long enough
+        return False
+
+    def compact(self, _stats=None):
+        # Always rebuilt from disk on the writer thread; in-memory stats are never shared
+        self._submit(("compact", None))
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._ops or self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    @property
+    def unsaved(self):
+        # Records accepted but not yet on disk because writing them failed
+        return len(self._failed)
+
+    def close(self, timeout=None):
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if hasattr(self.store, "close"):
+            self.store.close()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._ops and not self._closing:
+                    if self._failed:
+                        if not self._cond.wait(WRITE_RETRY_INTERVAL):
+                            break
+                    else:
+                        self._cond.wait()
+                closing = self._closing
+                ops, self._ops = self._ops, []
+                if not ops and not self._failed and closing:
+                    return
+                self._busy = True
+            self._write_batch(ops)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+            if closing and not self._ops:
+                # Last attempt for anything still failing; it stays in `unsaved`
+                return
+
+    @PROFILER.timed("write_batch")
+    def _write_batch(self, ops):
+        # Earlier failures go first so the journal keeps recording order
+        records = self._failed + [arg for kind, arg in ops if kind == "append"]
+        self._failed = []
+        compact = any(kind == "compact" for kind, _arg in ops)
+        for attempt in range(WRITE_RETRIES):
+            try:
+                with self.io_lock:
+                    if records:
+                        self.store.append_many(records)
+                        records = []
+                    if compact or self.store.should_compact():
+                        self.store.compact()
+                self.error = None
+                return
+            except Exception as e:
+                self.errors += 1
+                self.error = e
+                time.sleep(0.05 * (attempt + 1))
+        # Never dropped: keep the records for the next batch
+        self._failed = records
+        debug_log(f"stats write failed, {len(records)} record(s) pending: {self.error}")
+
+
+class LazyHistory(MutableMapping):
+    # Stats mapping for the app: today's bucket is loaded eagerly, the rest of
+    # the history only when something asks for another day or iterates.
+    # Buckets of days the app has already rolled past stay in memory (_recent),
+    # so a session split across midnight never forces a full load.
+    def __init__(self, store, today_key):
+        self.store = store
+        self.today_key = today_key
+        self._days = None
+        self._recent = {}
+        try:
+            self._today = store.load_day(today_key)
+        except LookupError:
+            self._ensure_loaded()
+
+    @property
+    def loaded(self):
+        return self._days is not None
+
+    def _ensure_loaded(self):
+        if self._days is None:
+            days = self.store.load()
+            # In-memory buckets are authoritative for the days they cover
+            days.update(self._recent)
+            self._recent = {}
+            if getattr(self, "_today", None) is not None:
+                days[self.today_key] = self._today
+            self._days = days
+            self._today = days.get(self.today_key)
+        return self._days
+
+    def roll_to(self, today_key):
+        # Day rollover: keep the old bucket at hand and load just the new day
+        if today_key == self.today_key:
+            return
+        if self._days is None and self._today is not None:
+            self._recent[self.today_key] = self._today
+        self.today_key = today_key
+        if self._days is not None:
+            self._today = self._days.get(today_key)
+            return
+        try:
+            self._today = self.store.load_day(today_key)
+        except LookupError:
+            self._today = None
+            self._ensure_loaded()
+
+    def range_days(self, start_key, end_key):
+        if self._days is None and hasattr(self.store, "range_days"):
+            days = self.store.range_days(start_key, end_key)
+        else:
+            days = {k: v for k, v in sorted(self._ensure_loaded().items()) if start_key <= k <= end_key}
+        for key, bucket in self._recent.items():
+            if start_key <= key <= end_key:
+                days[key] = bucket
+        if self._today is not None and start_key <= self.today_key <= end_key:
+            days[self.today_key] = self._today
+        return days
+
+    def __getitem__(self, key):
+        if key == self.today_key and self._today is not None:
+            return self._today
+        if key in self._recent:
+            return self._recent[key]
+        return self._ensure_loaded()[key]
+
+    def __setitem__(self, key, value):
+        if key == self.today_key:
+            self._today = value
+            if self._days is not None:
+                self._days[key] = value
+        elif key in self._recent:
+            self._recent[key] = value
+        else:
+            self._ensure_loaded()[key] = value
+
+    def __delitem__(self, key):
+        self._recent.pop(key, None)
+        del self._ensure_loaded()[key]
+        if key == self.today_key:
+            self._today = None
+
+    def __contains__(self, key):
+        if key == self.today_key:
+            return self._today is not None
+        if key in self._recent:
+            return True
+        return key in self._ensure_loaded()
+
+    def __iter__(self):
+        return iter(self._ensure_loaded())
+
+    def __len__(self):
+        return len(self._ensure_loaded())
@@ -0,0 +1,163 @@
+import math
+import time
+from collections import namedtuple
+
+# Deadline-based countdown: remaining time is always derived from the clock,
+# never from how many UI callbacks happened, so late callbacks cannot drift it.
+# The engine walks a precompiled timeline of phases and wraps around at the end.
+WORK = "work"
+BREAK = "break"
+LONG_BREAK = "long_break"
+
+Phase = namedtuple("Phase", ["kind", "seconds"])
+# ended_at is the clock() instant the phase ran out; pauses are (paused, resumed)
+# clock() pairs taken during that phase
+PhaseEnd = namedtuple("PhaseEnd", ["phase", "next_phase", "active_seconds", "ended_at", "pauses"],
+                      defaults=(None, ()))
+
+
+def simple_program(work, brk, cycles=1, long_break=0):
+    # cycles x (work / break), optionally followed by one long break
+    blocks = [{"repeat": max(1, cycles), "phases": [[WORK, work], [BREAK, brk]]}]
+    if long_break:
+        blocks.append({"phases": [[LONG_BREAK, long_break]]})
+    return {"blocks": blocks}
+
+
+def compile_program(program, unit_seconds=60):
+    phases = []
+    for block in program["blocks"]:
+        body = [Phase(kind, max(1, int(amount * unit_seconds))) for kind, amount in block["phases"]]
+        phases.extend(body * max(1, int(block.get("repeat", 1))))
+    return Timeline(phases)
+
+
+class Timeline:
+    def __init__(self, phases):
+        self.phases = tuple(phases)
+        # starts[i] = seconds from program start to the start of phase i
+        self.starts = []
+        total = 0
+        for phase in self.phases:
+            self.starts.append(total)
+            total += phase.seconds
+        self.total = total
+
+    def __len__(self):
+        return len(self.phases)
+
+    def __getitem__(self, index):
+        return self.phases[index]
+
+
+def two_phase_timeline(work_seconds, break_seconds):
+    return Timeline([Phase(WORK, max(1, work_seconds)), Phase(BREAK, max(1, break_seconds))])
+
+
+class TimerEngine:
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.timeline = two_phase_timeline(25 * 60, 5 * 60)
+        self.index = 0
+        self.running = False
+        self._deadline = None
+        self._remaining = float(self.phase_seconds)
+        self._pauses = []
+        self._paused_at = None
+
+    @property
+    def phase(self):
+        return self.timeline[self.index].kind
+
+    @property
+    def phase_seconds(self):
+        return self.timeline[self.index].seconds
+
+    def start(self, work_seconds, break_seconds):
+        self.start_program(two_phase_timeline(work_seconds, break_seconds))
+
+    def start_program(self, timeline):
+        self.running = False
+        self.set_timeline(timeline)
+        self.resume()
+
+    def set_timeline(self, timeline):
+        # Swap the program and rewind to its first phase, keeping the run/pause state
+        self.timeline = timeline
+        self.load(0)
+
+    def load(self, index):
+        self.index = index
+        self._remaining = float(self.phase_seconds)
+        self._pauses = []
+        self._paused_at = None
+        if self.running:
+            self._deadline = self.clock() + self._remaining
+
+    def pause(self):
+        if self.running:
+            self._remaining = self.remaining()
+            self.running = False
+            self._deadline = None
+            self._paused_at = self.clock()
+
+    def resume(self):
+        if not self.running:
+            self.running = True
+            self._deadline = self.clock() + self._remaining
+            if self._paused_at is not None:
+                self._pauses.append((self._paused_at, self._deadline - self._remaining))
+                self._paused_at = None
+
+    stop = pause
+
+    def reset(self, timeline=None):
+        self.running = False
+        self._deadline = None
+        if timeline is not None:
+            self.timeline = timeline
+        self.load(0)
+
+    def remaining(self):
+        if self.running:
+            return max(0.0, self._deadline - self.clock())
+        return self._remaining
+
+    def remaining_whole(self):
+        # Display value: a countdown shows 25:00 until a full second has passed
+        return int(math.ceil(self.remaining() - 1e-9))
+
+    def elapsed(self):
+        return self.phase_seconds - self.remaining()
+
+    def focus_seconds(self):
+        return int(self.elapsed()) if self.phase == WORK else 0
+
+    def program_elapsed(self):
+        return self.timeline.starts[self.index] + self.elapsed()
+
+    def program_remaining(self):
+        # Time left until the program wraps around; O(1) from the precomputed offsets
+        return self.timeline.total - self.program_elapsed()
+
+    def poll(self):
+        # Advance through every phase boundary that has passed, even several
+        # after a long stall; each next deadline is anchored on the previous one.
+        events = []
+        if not self.running:
+            return events
+        now = self.clock()
+        while now >= self._deadline:
+            ended = self.phase
+            active = self.phase_seconds if ended == WORK else 0
+            self.index = (self.index + 1) % len(self.timeline)
+            events.append(PhaseEnd(ended, self.phase, active, self._deadline, tuple(self._pauses)))
+            self._pauses = []
+            self._deadline += self.phase_seconds
+        self._remaining = max(0.0, self._deadline - now)
+        return events
+
+    def ms_until_next_second(self):
+        # Wake up just after the displayed second changes
+        frac = self.remaining() % 1.0
+        return max(20, int(frac * 1000) + 5)